@@ -1,21 +1,55 @@
 from __future__ import annotations
+import time
+from datetime import datetime
+from enum import Enum
 import typer
 from pathlib import Path
 from .segmenter import segment_letter_to_regions, segment_word_to_regions
-from .render_svg import render_letter_svg
+from .font_outline import text_bounds
+from .render_svg import fit_transform, render_letter_svg
 from .layout_year import layout_year
+from .layout_range import PERIODS, layout_range
+from .hit_test import write_lookup_grid
+from .fill_overlay import DEFAULT_FILL, fill_users, render_template
+from .poster import poster_grid, render_poster_tiles
+from .watch import watch as watch_manifest
+from .coloring import DEFAULT_PALETTE
+from .geometry_backend import BACKENDS
+from .seeds import SEED_METHODS
+from .glyph_atlas import DEFAULT_CHARSET, DEFAULT_REFERENCE_SIZE, build_atlas, load_atlas
 
 app = typer.Typer(no_args_is_help=True)
 
+# Choice types, so unknown names fail as usage errors
+Backend = Enum("Backend", {name: name for name in BACKENDS}, type=str)
+SeedMethod = Enum("SeedMethod", {name: name for name in SEED_METHODS}, type=str)
+Period = Enum("Period", {name: name for name in PERIODS}, type=str)
+
 @app.command("gen-letter")
 def gen_letter(
     letter: str = typer.Option(..., "--letter", "-l"),
     font: Path = typer.Option(..., "--font", "-f", exists=True),
     segments: int = typer.Option(..., "--segments", "-n", min=1),
     out: Path = typer.Option(..., "--out", "-o"),
+    atlas: Path = typer.Option(None, "--atlas", "-a", exists=True, help="Prebuilt glyph atlas (see build-atlas)"),
+    backend: Backend = typer.Option("shapely", "--backend", "-b", help="Geometry backend"),
+    colored: bool = typer.Option(False, "--colored", help="Fill regions so neighbours get different colors"),
+    palette: str = typer.Option(",".join(DEFAULT_PALETTE), "--palette", help="Comma-separated fill colors"),
+    tolerance: float = typer.Option(None, "--tolerance", "-t", min=0.0, help="Level of detail in output points"),
+    seeds: SeedMethod = typer.Option("random", "--seeds", help="Seed initializer"),
+    relax: int = typer.Option(None, "--relax", min=0, help="Lloyd iterations (default depends on --seeds)"),
+    repair: bool = typer.Option(True, "--repair/--no-repair", help="Guarantee exactly --segments regions"),
+    hit_grid: float = typer.Option(None, "--hit-grid", min=0.1,
+                                   help="Also write a region lookup grid with cells of this many points"),
 ):
     # Uppercase the letter by default
     letter = letter.upper()
+    glyph_atlas = load_atlas(atlas) if atlas else None
+
+    # Estimate the page-fit scale up front so tolerance can be converted to font units
+    output_scale = 1.0
+    if tolerance:
+        output_scale = fit_transform(text_bounds(letter, font, 420.0, atlas=glyph_atlas), 36.0)[0]
 
     result = segment_letter_to_regions(
         letter=letter,
@@ -23,20 +57,37 @@ def gen_letter(
         segments=segments,
         font_size=420.0,
         inset=6.0,
+        atlas=glyph_atlas,
+        backend=backend.value,
+        tolerance=tolerance,
+        output_scale=output_scale,
+        seed_method=seeds.value,
+        relax_iterations=relax,
+        repair=repair,
     )
 
-    svg_text = render_letter_svg(
-        page="letter",
-        margin=36.0,
-        outline_path_svg=result.outline_path_svg,
-        regions=result.regions,
-        labels=result.labels,
-        voronoi_edges=result.voronoi_edges,
-    )
+    try:
+        svg_text = render_letter_svg(
+            page="letter",
+            margin=36.0,
+            outline_path_svg=result.outline_path_svg,
+            regions=result.regions,
+            labels=result.labels,
+            palette=palette.split(",") if colored else None,
+            adjacency=result.adjacency if colored else None,
+            tolerance=tolerance,
+        )
+    except ValueError as e:
+        # Too few palette colors for the region graph
+        raise typer.BadParameter(str(e), param_hint="--palette")
 
     out.parent.mkdir(parents=True, exist_ok=True)
     out.write_text(svg_text, encoding="utf-8")
     typer.echo(f"Wrote: {out}")
+    if hit_grid:
+        grid_path = out.with_suffix(".hits.json")
+        write_lookup_grid(result, grid_path, cell=hit_grid)
+        typer.echo(f"Wrote: {grid_path}")
 
 
 @app.command("gen-word")
@@ -45,9 +96,25 @@ def gen_word(
     font: Path = typer.Option(..., "--font", "-f", exists=True),
     segments: int = typer.Option(..., "--segments", "-n", min=1),
     out: Path = typer.Option(..., "--out", "-o"),
+    atlas: Path = typer.Option(None, "--atlas", "-a", exists=True, help="Prebuilt glyph atlas (see build-atlas)"),
+    backend: Backend = typer.Option("shapely", "--backend", "-b", help="Geometry backend"),
+    colored: bool = typer.Option(False, "--colored", help="Fill regions so neighbours get different colors"),
+    palette: str = typer.Option(",".join(DEFAULT_PALETTE), "--palette", help="Comma-separated fill colors"),
+    tolerance: float = typer.Option(None, "--tolerance", "-t", min=0.0, help="Level of detail in output points"),
+    seeds: SeedMethod = typer.Option("random", "--seeds", help="Seed initializer"),
+    relax: int = typer.Option(None, "--relax", min=0, help="Lloyd iterations (default depends on --seeds)"),
+    repair: bool = typer.Option(True, "--repair/--no-repair", help="Guarantee exactly --segments regions"),
+    hit_grid: float = typer.Option(None, "--hit-grid", min=0.1,
+                                   help="Also write a region lookup grid with cells of this many points"),
 ):
     # Uppercase the word by default
     word = word.upper()
+    glyph_atlas = load_atlas(atlas) if atlas else None
+
+    # Estimate the page-fit scale up front so tolerance can be converted to font units
+    output_scale = 1.0
+    if tolerance:
+        output_scale = fit_transform(text_bounds(word, font, 420.0, atlas=glyph_atlas), 36.0)[0]
 
     result = segment_word_to_regions(
         word=word,
@@ -55,29 +122,48 @@ def gen_word(
         segments=segments,
         font_size=420.0,
         inset=6.0,
+        atlas=glyph_atlas,
+        backend=backend.value,
+        tolerance=tolerance,
+        output_scale=output_scale,
+        seed_method=seeds.value,
+        relax_iterations=relax,
+        repair=repair,
     )
 
-    svg_text = render_letter_svg(
-        page="letter",
-        margin=36.0,
-        outline_path_svg=result.outline_path_svg,
-        regions=result.regions,
-        labels=result.labels,
-        voronoi_edges=result.voronoi_edges,
-    )
+    try:
+        svg_text = render_letter_svg(
+            page="letter",
+            margin=36.0,
+            outline_path_svg=result.outline_path_svg,
+            regions=result.regions,
+            labels=result.labels,
+            palette=palette.split(",") if colored else None,
+            adjacency=result.adjacency if colored else None,
+            tolerance=tolerance,
+        )
+    except ValueError as e:
+        # Too few palette colors for the region graph
+        raise typer.BadParameter(str(e), param_hint="--palette")
 
     out.parent.mkdir(parents=True, exist_ok=True)
     out.write_text(svg_text, encoding="utf-8")
     typer.echo(f"Wrote: {out}")
+    if hit_grid:
+        grid_path = out.with_suffix(".hits.json")
+        write_lookup_grid(result, grid_path, cell=hit_grid)
+        typer.echo(f"Wrote: {grid_path}")
 
 
 @app.command("gen-calendar")
 def gen_calendar(
     font: Path = typer.Option(..., "--font", "-f", exists=True),
     out: Path = typer.Option("calendar.svg", "--out", "-o"),
+    atlas: Path = typer.Option(None, "--atlas", "-a", exists=True, help="Prebuilt glyph atlas (see build-atlas)"),
+    tolerance: float = typer.Option(None, "--tolerance", "-t", min=0.0, help="Level of detail in output points"),
 ):
     """Generate year calendar with all 12 months. Only adjustable option is font."""
-    layout_year(font, out)
+    layout_year(font, out, atlas=load_atlas(atlas) if atlas else None, tolerance=tolerance)
     typer.echo(f"Calendar generated: {out}")
 
 
@@ -85,11 +171,210 @@ def gen_calendar(
 def gen_year(
     font: Path = typer.Option(..., "--font", "-f", exists=True),
     out: Path = typer.Option("out/year_calendar.svg", "--out", "-o"),
+    atlas: Path = typer.Option(None, "--atlas", "-a", exists=True, help="Prebuilt glyph atlas (see build-atlas)"),
+    tolerance: float = typer.Option(None, "--tolerance", "-t", min=0.0, help="Level of detail in output points"),
 ):
     """Generate all 12 months on a single letter-sized page."""
-    layout_year(font, out)
+    layout_year(font, out, atlas=load_atlas(atlas) if atlas else None, tolerance=tolerance)
     typer.echo(f"Year calendar generated: {out}")
 
 
+@app.command("gen-range")
+def gen_range(
+    font: Path = typer.Option(..., "--font", "-f", exists=True),
+    start: datetime = typer.Option(..., "--start", formats=["%Y-%m-%d"]),
+    end: datetime = typer.Option(..., "--end", formats=["%Y-%m-%d"]),
+    period: Period = typer.Option("month", "--period", "-p", help="One word per period"),
+    per_page: int = typer.Option(12, "--per-page", min=1, help="Maximum words per page (fewer if they don't fit)"),
+    workers: int = typer.Option(None, "--workers", "-j", min=1),
+    out_dir: Path = typer.Option("out/range", "--out-dir", "-o"),
+    atlas: Path = typer.Option(None, "--atlas", "-a", exists=True, help="Prebuilt glyph atlas (see build-atlas)"),
+    backend: Backend = typer.Option("shapely", "--backend", "-b", help="Geometry backend"),
+    tolerance: float = typer.Option(None, "--tolerance", "-t", min=0.0, help="Level of detail in output points"),
+):
+    """Generate multi-page streak sheets for a date range, one region per day."""
+    pages = layout_range(
+        font,
+        out_dir,
+        start.date(),
+        end.date(),
+        period=period.value,
+        per_page=per_page,
+        workers=workers,
+        atlas=load_atlas(atlas) if atlas else None,
+        backend=backend.value,
+        tolerance=tolerance,
+    )
+    typer.echo(f"Range sheets generated: {len(pages)} pages in {out_dir}")
+
+
+@app.command("gen-poster")
+def gen_poster(
+    word: str = typer.Option(..., "--word", "-w"),
+    font: Path = typer.Option(..., "--font", "-f", exists=True),
+    segments: int = typer.Option(..., "--segments", "-n", min=1),
+    width: float = typer.Option(48.0, "--width", min=1.0, help="Poster width in inches"),
+    overlap: float = typer.Option(0.25, "--overlap", min=0.0, help="Tile overlap in inches"),
+    out_dir: Path = typer.Option("out/poster", "--out-dir", "-o"),
+    atlas: Path = typer.Option(None, "--atlas", "-a", exists=True, help="Prebuilt glyph atlas (see build-atlas)"),
+    backend: Backend = typer.Option("shapely", "--backend", "-b", help="Geometry backend"),
+    tolerance: float = typer.Option(None, "--tolerance", "-t", min=0.0, help="Level of detail in output points"),
+    seeds: SeedMethod = typer.Option("random", "--seeds", help="Seed initializer"),
+):
+    """Generate a wall poster as letter-sized tiles with overlap and registration marks."""
+    word = word.upper()
+    glyph_atlas = load_atlas(atlas) if atlas else None
+    poster_width = width * 72.0
+
+    # Poster scale from the outline bounds, so tolerance can be converted to font units
+    output_scale = 1.0
+    if tolerance:
+        output_scale = poster_grid(text_bounds(word, font, 420.0, atlas=glyph_atlas), poster_width)[0]
+
+    result = segment_word_to_regions(
+        word=word,
+        font_path=font,
+        segments=segments,
+        font_size=420.0,
+        inset=6.0,
+        atlas=glyph_atlas,
+        backend=backend.value,
+        tolerance=tolerance,
+        output_scale=output_scale,
+        seed_method=seeds.value,
+    )
+
+    count = 0
+    for tile in render_poster_tiles(result, out_dir, poster_width, overlap=overlap * 72.0, tolerance=tolerance):
+        count += 1
+        typer.echo(f"Wrote: {tile}")
+    typer.echo(f"Poster generated: {count} tiles in {out_dir}")
+
+
+@app.command("gen-template")
+def gen_template(
+    word: str = typer.Option(..., "--word", "-w"),
+    font: Path = typer.Option(..., "--font", "-f", exists=True),
+    segments: int = typer.Option(..., "--segments", "-n", min=1),
+    out: Path = typer.Option(..., "--out", "-o"),
+    atlas: Path = typer.Option(None, "--atlas", "-a", exists=True, help="Prebuilt glyph atlas (see build-atlas)"),
+    backend: Backend = typer.Option("shapely", "--backend", "-b", help="Geometry backend"),
+    tolerance: float = typer.Option(None, "--tolerance", "-t", min=0.0, help="Level of detail in output points"),
+    seeds: SeedMethod = typer.Option("random", "--seeds", help="Seed initializer"),
+    relax: int = typer.Option(None, "--relax", min=0, help="Lloyd iterations (default depends on --seeds)"),
+    repair: bool = typer.Option(True, "--repair/--no-repair", help="Guarantee exactly --segments regions"),
+):
+    """Render a word once into a fill template with stable region ids (see fill)."""
+    word = word.upper()
+    glyph_atlas = load_atlas(atlas) if atlas else None
+
+    # Estimate the page-fit scale up front so tolerance can be converted to font units
+    output_scale = 1.0
+    if tolerance:
+        output_scale = fit_transform(text_bounds(word, font, 420.0, atlas=glyph_atlas), 36.0)[0]
+
+    result = segment_word_to_regions(
+        word=word,
+        font_path=font,
+        segments=segments,
+        font_size=420.0,
+        inset=6.0,
+        atlas=glyph_atlas,
+        backend=backend.value,
+        tolerance=tolerance,
+        output_scale=output_scale,
+        seed_method=seeds.value,
+        relax_iterations=relax,
+        repair=repair,
+    )
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(render_template(result, tolerance=tolerance), encoding="utf-8")
+    typer.echo(f"Wrote: {out}")
+
+
+@app.command("fill")
+def fill(
+    template: Path = typer.Option(..., "--template", exists=True, dir_okay=False),
+    data: Path = typer.Option(..., "--data", "-d", exists=True, dir_okay=False,
+                              help="JSON: user -> completed region ids or ISO dates"),
+    start: datetime = typer.Option(None, "--start", formats=["%Y-%m-%d"], help="Date of region 1"),
+    color: str = typer.Option(DEFAULT_FILL, "--color"),
+    out_dir: Path = typer.Option("out/users", "--out-dir", "-o"),
+):
+    """Write one filled SVG per user by splicing their completions into a template."""
+    count = fill_users(template, data, out_dir, start=start.date() if start else None, color=color)
+    typer.echo(f"Filled {count} users into {out_dir}")
+
+
+@app.command("watch")
+def watch(
+    manifest: Path = typer.Argument(..., exists=True, dir_okay=False),
+    interval: float = typer.Option(1.0, "--interval", "-i", min=0.1, help="Seconds between checks"),
+    once: bool = typer.Option(False, "--once", help="Build what changed and exit"),
+):
+    """Rebuild manifest outputs whenever their inputs change, reusing cached geometry."""
+    watch_manifest(manifest, interval=interval, once=once)
+
+
+@app.command("build-atlas")
+def build_atlas_cmd(
+    font: Path = typer.Option(..., "--font", "-f", exists=True),
+    out: Path = typer.Option(None, "--out", "-o", help="Defaults to the font path with an .atlas suffix"),
+    charset: str = typer.Option(DEFAULT_CHARSET, "--charset", "-c"),
+    size: float = typer.Option(DEFAULT_REFERENCE_SIZE, "--size", min=1.0, help="Reference font size"),
+):
+    """Precompute glyph geometry for a font into a memory-mappable atlas file."""
+    if out is None:
+        out = font.with_suffix(".atlas")
+    count = build_atlas(font, out, charset=charset, reference_size=size)
+    typer.echo(f"Wrote: {out} ({count} glyphs)")
+
+
+@app.command("bench")
+def bench(
+    word: str = typer.Option("SEPTEMBER", "--word", "-w"),
+    font: Path = typer.Option(..., "--font", "-f", exists=True),
+    segments: list[int] = typer.Option([31, 200, 1000], "--segments", "-n", min=1),
+    backends: list[Backend] = typer.Option(list(BACKENDS), "--backend", "-b"),
+    seeds: list[SeedMethod] = typer.Option(list(SEED_METHODS), "--seeds"),
+    relax: list[int] = typer.Option([], "--relax", min=0, help="Lloyd iterations to try (default: per --seeds)"),
+    repeat: int = typer.Option(3, "--repeat", "-r", min=1),
+    atlas: Path = typer.Option(None, "--atlas", "-a", exists=True, help="Prebuilt glyph atlas (see build-atlas)"),
+):
+    """Time word segmentation per geometry backend and seed initializer.
+
+    Quality is the coefficient of variation of region areas (lower is more even).
+    """
+    word = word.upper()
+    glyph_atlas = load_atlas(atlas) if atlas else None
+
+    typer.echo(f"{'backend':<10} {'seeds':<14} {'relax':>5} {'segments':>8} {'regions':>8} {'area cv':>8} "
+               f"{'best s':>8} {'mean s':>8}")
+    for n in segments:
+        for backend in (b.value for b in backends):
+            for seed_method in (m.value for m in seeds):
+                for relax_iterations in relax or [SEED_METHODS[seed_method][1]]:
+                    timings = []
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        result = segment_word_to_regions(
+                            word=word,
+                            font_path=font,
+                            segments=n,
+                            font_size=420.0,
+                            inset=6.0,
+                            atlas=glyph_atlas,
+                            backend=backend,
+                            seed_method=seed_method,
+                            relax_iterations=relax_iterations,
+                        )
+                        timings.append(time.perf_counter() - start)
+                    areas = [r.poly.area for r in result.regions]
+                    mean_area = sum(areas) / len(areas)
+                    cv = (sum((a - mean_area) ** 2 for a in areas) / len(areas)) ** 0.5 / mean_area
+                    typer.echo(f"{backend:<10} {seed_method:<14} {relax_iterations:>5} {n:>8} {len(result.regions):>8} "
+                               f"{cv:>8.3f} {min(timings):>8.3f} {sum(timings) / len(timings):>8.3f}")
+
 if __name__ == "__main__":
     app()
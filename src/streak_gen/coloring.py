@@ -0,0 +1,121 @@
+"""Graph coloring of region adjacency for stained-glass fills."""
+import heapq
+
+# Muted stained-glass colors; DSATUR alone often needs 5 on large region graphs,
+# palettes of 4 or more rely on the Kempe-chain pass in palette_fills
+DEFAULT_PALETTE = ["#c0392b", "#2e86c1", "#f1c40f", "#27ae60", "#8e44ad", "#e67e22"]
+
+
+def dsatur_coloring(adjacency) -> dict[int, int]:
+    """Color a graph so that no two neighbours share a color (DSATUR heuristic).
+
+    Repeatedly colors the uncolored node with the most distinctly colored
+    neighbours (ties: highest degree, then lowest id) with the smallest free color.
+
+    Args:
+        adjacency: dict mapping node id -> set of neighbour ids
+
+    Returns:
+        dict mapping node id -> color index (0-based)
+    """
+    colors = {}
+    neighbour_colors = {node: set() for node in adjacency}
+
+    # Max-heap on (saturation, degree) via negation; stale entries are skipped
+    heap = [(0, -len(nbrs), node) for node, nbrs in adjacency.items()]
+    heapq.heapify(heap)
+
+    while heap:
+        neg_sat, _, node = heapq.heappop(heap)
+        if node in colors or -neg_sat != len(neighbour_colors[node]):
+            continue
+
+        used = neighbour_colors[node]
+        color = 0
+        while color in used:
+            color += 1
+        colors[node] = color
+
+        for nbr in adjacency[node]:
+            if nbr not in colors and color not in neighbour_colors[nbr]:
+                neighbour_colors[nbr].add(color)
+                heapq.heappush(heap, (-len(neighbour_colors[nbr]), -len(adjacency[nbr]), nbr))
+
+    return colors
+
+
+def _kempe_chain(adjacency, colors, start, a: int, b: int) -> set:
+    """Nodes reachable from start through nodes colored a or b."""
+    chain = {start}
+    stack = [start]
+    while stack:
+        node = stack.pop()
+        for nbr in adjacency[node]:
+            if nbr not in chain and colors[nbr] in (a, b):
+                chain.add(nbr)
+                stack.append(nbr)
+    return chain
+
+
+def _recolor_below(adjacency, colors, node, k: int) -> bool:
+    """Give node a color below k, swapping a Kempe chain among its neighbours if needed."""
+    used = {colors[nbr] for nbr in adjacency[node]}
+    free = [c for c in range(k) if c not in used]
+    if free:
+        colors[node] = free[0]
+        return True
+
+    for a in range(k):
+        for b in range(k):
+            if a == b:
+                continue
+            # Swap a and b on the chains through node's a-colored neighbours; that frees
+            # color a for node unless one of those chains reaches a b-colored neighbour
+            chain = set()
+            for nbr in adjacency[node]:
+                if colors[nbr] == a and nbr not in chain:
+                    chain |= _kempe_chain(adjacency, colors, nbr, a, b)
+            if any(colors[nbr] == b for nbr in adjacency[node] if nbr in chain):
+                continue
+            for member in chain:
+                colors[member] = b if colors[member] == a else a
+            colors[node] = a
+            return True
+    return False
+
+
+def fit_coloring(adjacency, k: int) -> dict[int, int] | None:
+    """DSATUR coloring moved into k colors by Kempe-chain swaps.
+
+    Returns:
+        dict mapping node id -> color index below k, or None if the swaps can't get there
+    """
+    colors = dsatur_coloring(adjacency)
+    for node in sorted(node for node, color in colors.items() if color >= k):
+        if _recolor_below(adjacency, colors, node, k):
+            continue
+        # Stuck: lift one neighbour out of the way, place node, then place the neighbour again
+        for nbr in sorted(adjacency[node]):
+            trial = dict(colors)
+            trial[nbr] = k
+            if _recolor_below(adjacency, trial, node, k) and _recolor_below(adjacency, trial, nbr, k):
+                colors = trial
+                break
+        else:
+            return None
+    return colors
+
+
+def palette_fills(adjacency, palette) -> dict[int, str]:
+    """Assign each region a palette color, differing from its neighbours.
+
+    Raises:
+        ValueError: if the palette has too few colors to keep neighbours apart
+    """
+    if not palette:
+        raise ValueError("Palette must contain at least one color")
+    colors = fit_coloring(adjacency, len(palette))
+    if colors is None:
+        raise ValueError(f"A palette of {len(palette)} colors can't keep these neighbouring regions apart, "
+                         f"use at least {max(len(palette) + 1, 4)}")
+    return {node: palette[color] for node, color in colors.items()}
@@ -0,0 +1,85 @@
+"""Per-user streak fills spliced into a pre-rendered template.
+
+The geometry is rendered once into a template whose region paths carry stable
+ids ("region-<id>") and whose style sheet holds a marker. Filling in a user's
+completed days only replaces that marker with one CSS rule, so thousands of
+per-user SVGs can be produced without touching the geometry again.
+"""
+from datetime import date
+import json
+import re
+from pathlib import Path
+from .render_svg import render_letter_svg
+
+FILL_MARKER = "/*streak-fills*/"
+DEFAULT_FILL = "#f4a340"
+
+
+def render_template(result, margin: float = 36.0, tolerance: float | None = None) -> str:
+    """Render a SegmentationResult as a fill template (see module docstring)."""
+    return render_letter_svg(
+        page="letter",
+        margin=margin,
+        outline_path_svg=result.outline_path_svg,
+        regions=result.regions,
+        labels=result.labels,
+        tolerance=tolerance,
+        region_ids=True,
+        style=FILL_MARKER,
+    )
+
+
+class FillTemplate:
+    """A template split at its fill marker, ready for fast per-user splicing."""
+
+    def __init__(self, template: str):
+        if FILL_MARKER not in template:
+            raise ValueError("Template has no fill marker; render it with render_template()")
+        self._head, self._tail = template.split(FILL_MARKER, 1)
+
+    def render(self, region_ids, color: str = DEFAULT_FILL) -> str:
+        """SVG with the given regions filled in color."""
+        region_ids = sorted(set(region_ids))
+        if not region_ids:
+            return self._head + self._tail
+        selector = ",".join(f"#region-{i}" for i in region_ids)
+        return f"{self._head}{selector}{{fill:{color}}}{self._tail}"
+
+
+def completion_region_ids(entries, start: date | None = None):
+    """Map a user's completions to region ids.
+
+    Entries are region ids (ints) or ISO dates; a date is day (date - start) + 1.
+    """
+    region_ids = []
+    for entry in entries:
+        if isinstance(entry, int):
+            region_ids.append(entry)
+            continue
+        if start is None:
+            raise ValueError(f"Completion {entry!r} is a date; a start date is needed to map it to a region")
+        day = (date.fromisoformat(entry) - start).days + 1
+        if day >= 1:
+            region_ids.append(day)
+    return region_ids
+
+
+def fill_users(template_path: Path, data_path: Path, out_dir: Path, start: date | None = None,
+               color: str = DEFAULT_FILL) -> int:
+    """Write one filled SVG per user from a template and a completion data file.
+
+    The data file is JSON mapping user -> list of completed region ids or ISO dates.
+
+    Returns:
+        Number of files written
+    """
+    template = FillTemplate(template_path.read_text(encoding="utf-8"))
+    completions = json.loads(data_path.read_text(encoding="utf-8"))
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for user, entries in completions.items():
+        # Keep user names from escaping the output directory or becoming hidden files
+        name = re.sub(r"[^\w.-]", "_", str(user)).lstrip(".") or "_"
+        svg_text = template.render(completion_region_ids(entries, start), color)
+        (out_dir / f"{name}.svg").write_text(svg_text, encoding="utf-8")
+    return len(completions)
@@ -1,9 +1,59 @@
+import math
 from pathlib import Path
 import skia
 from shapely.geometry import Polygon
 from shapely.ops import unary_union
 from shapely.affinity import translate
 
+# Path verbs as plain ints so they can be stored outside of skia (see glyph_atlas)
+MOVE_VERB = int(skia.Path.kMove_Verb)
+LINE_VERB = int(skia.Path.kLine_Verb)
+QUAD_VERB = int(skia.Path.kQuad_Verb)
+CONIC_VERB = int(skia.Path.kConic_Verb)
+CUBIC_VERB = int(skia.Path.kCubic_Verb)
+CLOSE_VERB = int(skia.Path.kClose_Verb)
+
+
+def skia_path_commands(glyph_path: skia.Path):
+    """Convert a Skia Path to a list of (verb, points) commands.
+
+    The points of each command exclude the current pen position, so a line
+    carries one point, a quad/conic two and a cubic three. Conic weights are
+    dropped (conics are treated as quads, as in the SVG output).
+    """
+    commands = []
+    for verb, pts in glyph_path:
+        verb = int(verb)
+        if verb == MOVE_VERB:
+            points = [(pts[0].x(), pts[0].y())]
+        elif verb == CLOSE_VERB:
+            points = []
+        else:
+            points = [(p.x(), p.y()) for p in pts[1:]]
+            if verb == CONIC_VERB:
+                points = points[:2]
+        commands.append((verb, points))
+    return commands
+
+
+def commands_to_svg_path(commands, x_offset: float = 0.0) -> str:
+    """Convert path commands to an SVG path string, shifted by x_offset."""
+    path_commands = []
+    for verb, points in commands:
+        if verb == MOVE_VERB:
+            path_commands.append(f"M {points[0][0] + x_offset} {points[0][1]}")
+        elif verb == LINE_VERB:
+            path_commands.append(f"L {points[0][0] + x_offset} {points[0][1]}")
+        elif verb in (QUAD_VERB, CONIC_VERB):
+            # Conic is written as a quad (simplified - could use ConvertConicToQuads for better accuracy)
+            path_commands.append(f"Q {points[0][0] + x_offset} {points[0][1]} {points[1][0] + x_offset} {points[1][1]}")
+        elif verb == CUBIC_VERB:
+            path_commands.append(f"C {points[0][0] + x_offset} {points[0][1]} {points[1][0] + x_offset} {points[1][1]} {points[2][0] + x_offset} {points[2][1]}")
+        elif verb == CLOSE_VERB:
+            path_commands.append("Z")
+    return " ".join(path_commands)
+
+
 def glyph_outline_svg_path(letter: str, font_path: Path, font_size: float):
     tf = skia.Typeface.MakeFromFile(str(font_path))
     font = skia.Font(tf, font_size)
@@ -12,55 +62,55 @@ def glyph_outline_svg_path(letter: str, font_path: Path, font_size: float):
     glyph_path = paths[0]
 
     # Convert skia.Path to SVG path string
-    path_commands = []
-    for verb, points in glyph_path:
-        if verb == skia.Path.kMove_Verb:
-            path_commands.append(f"M {points[0].x()} {points[0].y()}")
-        elif verb == skia.Path.kLine_Verb:
-            path_commands.append(f"L {points[1].x()} {points[1].y()}")
-        elif verb == skia.Path.kQuad_Verb:
-            path_commands.append(f"Q {points[1].x()} {points[1].y()} {points[2].x()} {points[2].y()}")
-        elif verb == skia.Path.kCubic_Verb:
-            path_commands.append(f"C {points[1].x()} {points[1].y()} {points[2].x()} {points[2].y()} {points[3].x()} {points[3].y()}")
-        elif verb == skia.Path.kConic_Verb:
-            # Convert conic to cubic (simplified - could use ConvertConicToQuads for better accuracy)
-            path_commands.append(f"Q {points[1].x()} {points[1].y()} {points[2].x()} {points[2].y()}")
-        elif verb == skia.Path.kClose_Verb:
-            path_commands.append("Z")
-
-    svg_path_d = " ".join(path_commands)
+    svg_path_d = commands_to_svg_path(skia_path_commands(glyph_path))
     return svg_path_d, glyph_path
 
-def skia_path_to_polygon(glyph_path: skia.Path, flatness: float = 1.0) -> Polygon:
-    """Convert a Skia Path to a Shapely Polygon by flattening curves.
 
-    Handles multiple contours: first contour is exterior, subsequent ones are holes.
+def _curve_segments(ctrl, tolerance: float, weight: float) -> int:
+    """Number of uniform steps that keep a Bezier within tolerance of its chords.
+
+    The chord error of a step h is bounded by max|B''| * h^2 / 8, and max|B''| is
+    weight * (largest second difference of the control points).
+    """
+    dd = max(math.hypot(a[0] - 2 * b[0] + c[0], a[1] - 2 * b[1] + c[1])
+             for a, b, c in zip(ctrl, ctrl[1:], ctrl[2:]))
+    return max(1, math.ceil(math.sqrt(weight * dd / (8 * tolerance))))
+
+
+def commands_to_contours(commands, flatness: float = 1.0, tolerance: float | None = None):
+    """Flatten path commands into a list of contours (lists of (x, y) points).
+
+    By default every curve gets a fixed number of steps (scaled by flatness). If
+    tolerance is given, steps are chosen per curve so the flattened contour stays
+    within tolerance (in path units) of the curve.
     """
     contours = []  # List of contours (each is a list of points)
     current_contour = []
     current_pos = None
 
-    for verb, pts in glyph_path:
-        if verb == skia.Path.kMove_Verb:
+    for verb, pts in commands:
+        if verb == MOVE_VERB:
             # Starting a new contour
             if current_contour:
                 # Save the previous contour
                 contours.append(current_contour)
                 current_contour = []
 
-            current_pos = (pts[0].x(), pts[0].y())
+            current_pos = pts[0]
             current_contour.append(current_pos)
 
-        elif verb == skia.Path.kLine_Verb:
-            current_pos = (pts[1].x(), pts[1].y())
+        elif verb == LINE_VERB:
+            current_pos = pts[0]
             current_contour.append(current_pos)
 
-        elif verb == skia.Path.kQuad_Verb:
-            # Flatten quadratic Bezier curve
-            p0 = (pts[0].x(), pts[0].y())
-            p1 = (pts[1].x(), pts[1].y())
-            p2 = (pts[2].x(), pts[2].y())
-            num_segments = max(2, int(10 / flatness))
+        elif verb in (QUAD_VERB, CONIC_VERB):
+            # Flatten quadratic Bezier curve (conics are approximated as quads)
+            p0 = current_pos
+            p1, p2 = pts
+            if tolerance is None:
+                num_segments = max(2, int(10 / flatness))
+            else:
+                num_segments = _curve_segments((p0, p1, p2), tolerance, 2)
             for i in range(1, num_segments + 1):
                 t = i / num_segments
                 x = (1-t)**2 * p0[0] + 2*(1-t)*t * p1[0] + t**2 * p2[0]
@@ -68,13 +118,14 @@ def skia_path_to_polygon(glyph_path: skia.Path, flatness: float = 1.0) -> Polygo
                 current_contour.append((x, y))
             current_pos = p2
 
-        elif verb == skia.Path.kCubic_Verb:
+        elif verb == CUBIC_VERB:
             # Flatten cubic Bezier curve
-            p0 = (pts[0].x(), pts[0].y())
-            p1 = (pts[1].x(), pts[1].y())
-            p2 = (pts[2].x(), pts[2].y())
-            p3 = (pts[3].x(), pts[3].y())
-            num_segments = max(2, int(15 / flatness))
+            p0 = current_pos
+            p1, p2, p3 = pts
+            if tolerance is None:
+                num_segments = max(2, int(15 / flatness))
+            else:
+                num_segments = _curve_segments((p0, p1, p2, p3), tolerance, 6)
             for i in range(1, num_segments + 1):
                 t = i / num_segments
                 x = (1-t)**3 * p0[0] + 3*(1-t)**2*t * p1[0] + 3*(1-t)*t**2 * p2[0] + t**3 * p3[0]
@@ -82,20 +133,7 @@ def skia_path_to_polygon(glyph_path: skia.Path, flatness: float = 1.0) -> Polygo
                 current_contour.append((x, y))
             current_pos = p3
 
-        elif verb == skia.Path.kConic_Verb:
-            # Flatten conic
-            p0 = (pts[0].x(), pts[0].y())
-            p1 = (pts[1].x(), pts[1].y())
-            p2 = (pts[2].x(), pts[2].y())
-            num_segments = max(2, int(10 / flatness))
-            for i in range(1, num_segments + 1):
-                t = i / num_segments
-                x = (1-t)**2 * p0[0] + 2*(1-t)*t * p1[0] + t**2 * p2[0]
-                y = (1-t)**2 * p0[1] + 2*(1-t)*t * p1[1] + t**2 * p2[1]
-                current_contour.append((x, y))
-            current_pos = p2
-
-        elif verb == skia.Path.kClose_Verb:
+        elif verb == CLOSE_VERB:
             # Close the current contour
             pass
 
@@ -103,6 +141,11 @@ def skia_path_to_polygon(glyph_path: skia.Path, flatness: float = 1.0) -> Polygo
     if current_contour:
         contours.append(current_contour)
 
+    return contours
+
+
+def contours_to_polygon(contours) -> Polygon:
+    """Build a Polygon from flattened contours: first is exterior, rest are holes."""
     if len(contours) == 0:
         raise ValueError("No contours found in path")
 
@@ -117,38 +160,117 @@ def skia_path_to_polygon(glyph_path: skia.Path, flatness: float = 1.0) -> Polygo
     return Polygon(shell=exterior, holes=holes)
 
 
-def word_outline_svg_path(word: str, font_path: Path, font_size: float):
-    """Get the outline for an entire word with proper letter spacing.
+def skia_path_to_polygon(glyph_path: skia.Path, flatness: float = 1.0) -> Polygon:
+    """Convert a Skia Path to a Shapely Polygon by flattening curves.
+
+    Handles multiple contours: first contour is exterior, subsequent ones are holes.
+    """
+    return contours_to_polygon(commands_to_contours(skia_path_commands(glyph_path), flatness))
+
+
+def text_glyphs(text: str, font_path: Path, font_size: float, atlas=None):
+    """Get the outline commands and advance width of each glyph in text.
+
+    If a GlyphAtlas is given, glyphs are read from it instead of the font file.
 
     Returns:
-        (svg_path_d, combined_polygon, letter_polygons): SVG path string, Shapely polygon for the word,
-        and list of individual letter polygons
+        list of (commands, contours, advance) per character. commands is None for
+        glyphs without an outline (e.g. space); contours holds pre-flattened
+        contours when available from the atlas, else None.
     """
+    if atlas is not None:
+        return [
+            (atlas.commands(ch, font_size), atlas.contours(ch, font_size), atlas.advance(ch, font_size))
+            for ch in text
+        ]
+
     tf = skia.Typeface.MakeFromFile(str(font_path))
     font = skia.Font(tf, font_size)
 
-    # Get glyphs and their positions
-    glyphs = font.textToGlyphs(word)
-
-    # Get widths for each glyph to position them
+    # Get glyphs, their widths (to position them) and their paths
+    glyphs = font.textToGlyphs(text)
     widths = font.getWidths(glyphs)
-
-    # Get paths for each glyph
     paths = font.getPaths(glyphs)
 
-    # Process each letter
+    return [
+        (skia_path_commands(glyph_path) if glyph_path is not None else None, None, width)
+        for glyph_path, width in zip(paths, widths)
+    ]
+
+
+def letter_svg_path(letter: str, font_path: Path, font_size: float, atlas=None) -> str:
+    """Get the SVG outline path for a single letter."""
+    commands, _, _ = text_glyphs(letter, font_path, font_size, atlas=atlas)[0]
+    if commands is None:
+        raise ValueError(f"No outline for letter: {letter}")
+    return commands_to_svg_path(commands)
+
+
+def letter_polygon(letter: str, font_path: Path, font_size: float, atlas=None,
+                   tolerance: float | None = None) -> Polygon:
+    """Get the flattened polygon for a single letter.
+
+    tolerance (in font units) switches to adaptive curve flattening, see commands_to_contours.
+    """
+    commands, contours, _ = text_glyphs(letter, font_path, font_size, atlas=atlas)[0]
+    if commands is None:
+        raise ValueError(f"No outline for letter: {letter}")
+    if contours is None or tolerance is not None:
+        contours = commands_to_contours(commands, tolerance=tolerance)
+    return contours_to_polygon(contours)
+
+
+def word_svg_path(word: str, font_path: Path, font_size: float, atlas=None) -> str:
+    """Get the SVG outline path for an entire word with proper letter spacing."""
     svg_paths = []
+    x_offset = 0.0
+    for commands, _, width in text_glyphs(word, font_path, font_size, atlas=atlas):
+        if commands is not None:
+            svg_paths.append(commands_to_svg_path(commands, x_offset))
+        x_offset += width
+    return " ".join(svg_paths)
+
+
+def text_glyph_outlines(text: str, font_path: Path, font_size: float, atlas=None):
+    """Get each glyph's SVG outline at the origin, with its x offset in the text.
+
+    Glyphs without an outline (e.g. space) are skipped. Repeated letters give
+    identical path strings, so callers can define each once and reuse it.
+
+    Returns:
+        list of (svg_path_d, x_offset)
+    """
+    outlines = []
+    x_offset = 0.0
+    for commands, _, width in text_glyphs(text, font_path, font_size, atlas=atlas):
+        if commands is not None:
+            outlines.append((commands_to_svg_path(commands), x_offset))
+        x_offset += width
+    return outlines
+
+
+def word_polygons(word: str, font_path: Path, font_size: float, atlas=None, tolerance: float | None = None):
+    """Get the polygon for an entire word with proper letter spacing.
+
+    tolerance (in font units) switches to adaptive curve flattening, see commands_to_contours.
+
+    Returns:
+        (combined_polygon, letter_polygons): Shapely polygon for the word and list of
+        individual letter polygons
+    """
     polygons = []
     x_offset = 0.0
 
-    for i, (glyph_path, width) in enumerate(zip(paths, widths)):
-        if glyph_path is None:
+    for commands, contours, width in text_glyphs(word, font_path, font_size, atlas=atlas):
+        if commands is None:
             # Space or missing glyph
             x_offset += width
             continue
 
         # Convert path to polygon
-        poly = skia_path_to_polygon(glyph_path)
+        if contours is None or tolerance is not None:
+            contours = commands_to_contours(commands, tolerance=tolerance)
+        poly = contours_to_polygon(contours)
 
         # Clean up polygon geometry with buffer(0) to fix topology issues
         poly = poly.buffer(0)
@@ -159,24 +281,6 @@ def word_outline_svg_path(word: str, font_path: Path, font_size: float):
 
         polygons.append(poly)
 
-        # Convert to SVG path and translate
-        path_commands = []
-        for verb, points in glyph_path:
-            if verb == skia.Path.kMove_Verb:
-                path_commands.append(f"M {points[0].x() + x_offset} {points[0].y()}")
-            elif verb == skia.Path.kLine_Verb:
-                path_commands.append(f"L {points[1].x() + x_offset} {points[1].y()}")
-            elif verb == skia.Path.kQuad_Verb:
-                path_commands.append(f"Q {points[1].x() + x_offset} {points[1].y()} {points[2].x() + x_offset} {points[2].y()}")
-            elif verb == skia.Path.kCubic_Verb:
-                path_commands.append(f"C {points[1].x() + x_offset} {points[1].y()} {points[2].x() + x_offset} {points[2].y()} {points[3].x() + x_offset} {points[3].y()}")
-            elif verb == skia.Path.kConic_Verb:
-                path_commands.append(f"Q {points[1].x() + x_offset} {points[1].y()} {points[2].x() + x_offset} {points[2].y()}")
-            elif verb == skia.Path.kClose_Verb:
-                path_commands.append("Z")
-
-        svg_paths.append(" ".join(path_commands))
-
         # Move to next letter position
         x_offset += width
 
@@ -188,7 +292,33 @@ def word_outline_svg_path(word: str, font_path: Path, font_size: float):
     else:
         combined_poly = unary_union(polygons)
 
-    # Combine all SVG paths
-    svg_path_d = " ".join(svg_paths)
+    return combined_poly, polygons
+
+
+def word_outline_svg_path(word: str, font_path: Path, font_size: float, atlas=None):
+    """Get the outline for an entire word with proper letter spacing.
+
+    Returns:
+        (svg_path_d, combined_polygon, letter_polygons): SVG path string, Shapely polygon for the word,
+        and list of individual letter polygons
+    """
+    combined_poly, polygons = word_polygons(word, font_path, font_size, atlas=atlas)
+    return word_svg_path(word, font_path, font_size, atlas=atlas), combined_poly, polygons
+
+
+def text_bounds(text: str, font_path: Path, font_size: float, atlas=None):
+    """Bounds (minx, miny, maxx, maxy) of the outline control points of text.
 
-    return svg_path_d, combined_poly, polygons
+    Control points bound their curves, so this is a cheap, slightly loose box that
+    needs no flattening.
+    """
+    xs, ys = [], []
+    x_offset = 0.0
+    for commands, _, width in text_glyphs(text, font_path, font_size, atlas=atlas):
+        for _, points in commands or []:
+            xs.extend(x + x_offset for x, _ in points)
+            ys.extend(y for _, y in points)
+        x_offset += width
+    if not xs:
+        raise ValueError(f"No valid glyphs found in text: {text}")
+    return min(xs), min(ys), max(xs), max(ys)
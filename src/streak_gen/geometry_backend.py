@@ -0,0 +1,176 @@
+"""Selectable geometry backends for insetting the glyph polygon and clipping cells.
+
+"shapely" uses GEOS buffer/intersection. "pyclipper" runs the same operations
+with Clipper on integer coordinates (scaled by CLIPPER_SCALE). For clipping,
+the polygon is first cut into small pieces, and each cell is only clipped
+against the pieces its bounding box overlaps, so the cost per cell does not
+grow with the size of the whole word.
+"""
+import numpy as np
+import pyclipper
+import shapely
+from shapely.geometry import MultiPolygon, Polygon
+
+BACKENDS = ("shapely", "pyclipper")
+
+# Fixed-point scale for Clipper integer coordinates (1/1024 of a font unit)
+CLIPPER_SCALE = 1024.0
+# Max deviation of round offset joins, in font units
+CLIPPER_ARC_TOLERANCE = 0.25
+# Clip polygon pieces are cut down to about this many vertices
+CLIPPER_PIECE_VERTICES = 64
+
+
+def _check_backend(backend: str):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown geometry backend: {backend} (expected one of {', '.join(BACKENDS)})")
+
+
+def _to_clipper(coords):
+    return np.round(np.asarray(coords, dtype=np.float64)[:, :2] * CLIPPER_SCALE).astype(np.int64).tolist()
+
+
+def _polygon_to_clipper(geom):
+    """Convert a Polygon/MultiPolygon to a list of integer Clipper paths."""
+    paths = []
+    for poly in getattr(geom, "geoms", [geom]):
+        if poly.is_empty:
+            continue
+        # Drop the closing point, Clipper paths are implicitly closed
+        paths.append(_to_clipper(poly.exterior.coords)[:-1])
+        paths.extend(_to_clipper(ring.coords)[:-1] for ring in poly.interiors)
+    return paths
+
+
+def _polytree_to_geometry(tree):
+    """Convert a Clipper PolyTree to a Polygon, MultiPolygon or empty Polygon."""
+    polygons = []
+    stack = list(tree.Childs)
+    while stack:
+        node = stack.pop()
+        if len(node.Contour) < 3:
+            continue
+        holes = []
+        for child in node.Childs:
+            if len(child.Contour) >= 3:
+                holes.append(np.asarray(child.Contour, dtype=np.float64) / CLIPPER_SCALE)
+            # Islands inside holes are outer polygons of their own
+            stack.extend(child.Childs)
+        polygons.append(Polygon(np.asarray(node.Contour, dtype=np.float64) / CLIPPER_SCALE, holes))
+
+    if not polygons:
+        return Polygon()
+    if len(polygons) == 1:
+        return polygons[0]
+    return MultiPolygon(polygons)
+
+
+def _split_clipper_paths(paths, max_vertices: int = CLIPPER_PIECE_VERTICES, max_depth: int = 16):
+    """Cut Clipper paths into pieces of at most max_vertices by halving across the longer side.
+
+    Neighbouring pieces overlap by one font unit, so a cell clipped against
+    several of them with the non-zero fill rule comes out as one polygon instead
+    of parts that only touch along the cut.
+
+    Returns:
+        list of (paths, (min_x, min_y, max_x, max_y)) per non-empty piece
+    """
+    overlap = int(CLIPPER_SCALE)
+    pieces = []
+    # Orient outer rings and holes consistently, as the non-zero fill rule needs
+    stack = [(pyclipper.SimplifyPolygons(paths, pyclipper.PFT_EVENODD), max_depth)]
+    while stack:
+        paths, depth = stack.pop()
+        if not paths:
+            continue
+        points = np.concatenate([np.asarray(path) for path in paths])
+        (min_x, min_y), (max_x, max_y) = points.min(axis=0), points.max(axis=0)
+        if len(points) <= max_vertices or depth == 0:
+            pieces.append((paths, (min_x, min_y, max_x, max_y)))
+            continue
+
+        if max_x - min_x >= max_y - min_y:
+            mid = (min_x + max_x) // 2
+            halves = ((min_x, min_y, mid + overlap, max_y), (mid - overlap, min_y, max_x, max_y))
+        else:
+            mid = (min_y + max_y) // 2
+            halves = ((min_x, min_y, max_x, mid + overlap), (min_x, mid - overlap, max_x, max_y))
+        for x0, y0, x1, y1 in halves:
+            pc = pyclipper.Pyclipper()
+            pc.AddPaths(paths, pyclipper.PT_SUBJECT, True)
+            pc.AddPath([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], pyclipper.PT_CLIP, True)
+            stack.append((pc.Execute(pyclipper.CT_INTERSECTION, pyclipper.PFT_NONZERO, pyclipper.PFT_NONZERO),
+                          depth - 1))
+    return pieces
+
+
+def inset_polygon(poly, inset: float, backend: str = "shapely"):
+    """Shrink poly by inset (holes grow), retrying at half inset if that fails."""
+    _check_backend(backend)
+    if inset <= 0:
+        return poly
+
+    if backend == "shapely":
+        # Negative buffer shrinks exterior and expands holes
+        inset_poly = poly.buffer(-inset)
+
+        # Clean up geometry
+        if not inset_poly.is_valid or inset_poly.is_empty:
+            inset_poly = poly.buffer(-inset * 0.5)  # Try with less aggressive inset
+        return inset_poly
+
+    offset = pyclipper.PyclipperOffset(arc_tolerance=CLIPPER_ARC_TOLERANCE * CLIPPER_SCALE)
+    offset.AddPaths(_polygon_to_clipper(poly), pyclipper.JT_ROUND, pyclipper.ET_CLOSEDPOLYGON)
+    inset_poly = _polytree_to_geometry(offset.Execute2(-inset * CLIPPER_SCALE))
+    if inset_poly.is_empty:
+        inset_poly = _polytree_to_geometry(offset.Execute2(-inset * 0.5 * CLIPPER_SCALE))
+    return inset_poly
+
+
+def clip_cells(cells, poly, backend: str = "shapely"):
+    """Intersect every cell with poly.
+
+    Returns:
+        list of geometries aligned with cells (empty where a cell misses poly)
+    """
+    _check_backend(backend)
+
+    if backend == "shapely":
+        shapely.prepare(poly)
+        return list(shapely.intersection(np.asarray(cells, dtype=object), poly))
+
+    # Cut the clip polygon into small pieces and find the ones near each cell
+    pieces = _split_clipper_paths(_polygon_to_clipper(poly))
+    if not pieces or not len(cells):
+        return [Polygon() for _ in cells]
+    piece_boxes = shapely.box(*(np.array([bounds for _, bounds in pieces], dtype=np.float64).T / CLIPPER_SCALE))
+    cell_idx, piece_idx = shapely.STRtree(piece_boxes).query(np.asarray(cells, dtype=object))
+    order = np.argsort(cell_idx, kind="stable")
+    nearby = np.split(piece_idx[order], np.searchsorted(cell_idx[order], np.arange(1, len(cells))))
+
+    # Scale all cell rings in one batch
+    rings = [np.asarray(cell.exterior.coords)[:-1, :2] for cell in cells]
+    sizes = [len(ring) for ring in rings]
+    scaled = _to_clipper(np.concatenate(rings))
+
+    clipped = []
+    start = 0
+    for size, piece_ids in zip(sizes, nearby):
+        subject = scaled[start:start + size]
+        start += size
+        if not len(piece_ids):
+            clipped.append(Polygon())
+            continue
+
+        pc = pyclipper.Pyclipper()
+        for i in piece_ids.tolist():
+            pc.AddPaths(pieces[i][0], pyclipper.PT_CLIP, True)
+        try:
+            pc.AddPath(subject, pyclipper.PT_SUBJECT, True)
+        except pyclipper.ClipperException:
+            # Degenerate cell (fewer than 3 distinct points)
+            clipped.append(Polygon())
+            continue
+        tree = pc.Execute2(pyclipper.CT_INTERSECTION, pyclipper.PFT_NONZERO, pyclipper.PFT_NONZERO)
+        clipped.append(_polytree_to_geometry(tree))
+    return clipped
@@ -0,0 +1,198 @@
+"""Prebuilt glyph atlas: flattened contours, advances and outline commands in one file.
+
+The atlas is built once from a font at a reference size and memory-mapped at
+load time, so worker processes share a single read-only copy of the glyph
+geometry instead of each re-parsing the TTF and re-flattening curves.
+
+File layout (little-endian, every section 4-byte aligned):
+    header     magic, version, reference size, section counts
+    glyphs     one GLYPH_DTYPE record per character
+    contours   (start, end) point index pairs into the flattened points
+    points     float32 (x, y) flattened contour points
+    cmd_points float32 (x, y) outline command points
+    verbs      uint8 path verbs (see font_outline)
+"""
+from functools import lru_cache
+import mmap
+from pathlib import Path
+import string
+import struct
+import numpy as np
+import skia
+from .font_outline import CLOSE_VERB, CONIC_VERB, CUBIC_VERB, LINE_VERB, MOVE_VERB, QUAD_VERB
+from .font_outline import commands_to_contours, skia_path_commands
+
+ATLAS_MAGIC = b"SGA1"
+ATLAS_VERSION = 1
+DEFAULT_CHARSET = string.ascii_letters + string.digits + string.punctuation + " "
+DEFAULT_REFERENCE_SIZE = 1000.0
+
+# magic, version, reserved, reference size, glyph/contour/point/command point/verb counts
+HEADER = struct.Struct("<4sHHfIIIII")
+
+GLYPH_DTYPE = np.dtype([
+    ("codepoint", "<u4"),
+    ("advance", "<f4"),
+    ("contour_start", "<u4"),
+    ("contour_count", "<u4"),
+    ("verb_start", "<u4"),
+    ("verb_count", "<u4"),
+    ("cmd_point_start", "<u4"),
+    ("cmd_point_count", "<u4"),
+])
+
+# Number of stored points per verb
+_VERB_POINTS = {MOVE_VERB: 1, LINE_VERB: 1, QUAD_VERB: 2, CONIC_VERB: 2, CUBIC_VERB: 3, CLOSE_VERB: 0}
+
+
+def build_atlas(font_path: Path, out_path: Path, charset: str = DEFAULT_CHARSET,
+                reference_size: float = DEFAULT_REFERENCE_SIZE):
+    """Precompute glyph geometry for charset and write it to an atlas file.
+
+    Args:
+        font_path: Path to the font file
+        out_path: Where to write the atlas
+        charset: Characters to include (duplicates are ignored)
+        reference_size: Font size the geometry is stored at
+
+    Returns:
+        Number of glyphs written
+    """
+    tf = skia.Typeface.MakeFromFile(str(font_path))
+    if tf is None:
+        raise ValueError(f"Could not load font: {font_path}")
+    font = skia.Font(tf, reference_size)
+
+    chars = list(dict.fromkeys(charset))
+    glyphs = font.textToGlyphs("".join(chars))
+    widths = font.getWidths(glyphs)
+    paths = font.getPaths(glyphs)
+
+    records = np.zeros(len(chars), dtype=GLYPH_DTYPE)
+    contour_ranges = []
+    points = []
+    cmd_points = []
+    verbs = []
+
+    for i, (ch, glyph_path, width) in enumerate(zip(chars, paths, widths)):
+        commands = skia_path_commands(glyph_path) if glyph_path is not None else []
+        contours = commands_to_contours(commands)
+
+        records[i] = (
+            ord(ch), width,
+            len(contour_ranges), len(contours),
+            len(verbs), len(commands),
+            len(cmd_points), sum(len(pts) for _, pts in commands),
+        )
+
+        for contour in contours:
+            contour_ranges.append((len(points), len(points) + len(contour)))
+            points.extend(contour)
+        for verb, pts in commands:
+            verbs.append(verb)
+            cmd_points.extend(pts)
+
+    header = HEADER.pack(
+        ATLAS_MAGIC, ATLAS_VERSION, 0, reference_size,
+        len(records), len(contour_ranges), len(points), len(cmd_points), len(verbs),
+    )
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "wb") as f:
+        f.write(header)
+        f.write(records.tobytes())
+        f.write(np.asarray(contour_ranges, dtype="<u4").reshape(-1, 2).tobytes())
+        f.write(np.asarray(points, dtype="<f4").reshape(-1, 2).tobytes())
+        f.write(np.asarray(cmd_points, dtype="<f4").reshape(-1, 2).tobytes())
+        f.write(np.asarray(verbs, dtype="u1").tobytes())
+
+    return len(records)
+
+
+class GlyphAtlas:
+    """Read-only, memory-mapped view of an atlas file, scaled on access.
+
+    Use load_atlas() to open one; instances pickle by path so worker processes
+    re-open (and share) the same mapping instead of copying the geometry.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, reference_size, n_glyphs, n_contours, n_points, n_cmd_points, n_verbs = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != ATLAS_MAGIC or version != ATLAS_VERSION:
+            raise ValueError(f"Not a glyph atlas (or unsupported version): {self.path}")
+        self.reference_size = reference_size
+
+        offset = HEADER.size
+        self._glyphs = np.frombuffer(self._mm, dtype=GLYPH_DTYPE, count=n_glyphs, offset=offset)
+        offset += self._glyphs.nbytes
+        self._contours = np.frombuffer(self._mm, dtype="<u4", count=n_contours * 2, offset=offset).reshape(-1, 2)
+        offset += self._contours.nbytes
+        self._points = np.frombuffer(self._mm, dtype="<f4", count=n_points * 2, offset=offset).reshape(-1, 2)
+        offset += self._points.nbytes
+        self._cmd_points = np.frombuffer(self._mm, dtype="<f4", count=n_cmd_points * 2, offset=offset).reshape(-1, 2)
+        offset += self._cmd_points.nbytes
+        self._verbs = np.frombuffer(self._mm, dtype="u1", count=n_verbs, offset=offset)
+
+        self._index = {chr(cp): i for i, cp in enumerate(self._glyphs["codepoint"].tolist())}
+
+    def __reduce__(self):
+        return (load_atlas, (str(self.path),))
+
+    def __contains__(self, ch: str) -> bool:
+        return ch in self._index
+
+    def _record(self, ch: str):
+        try:
+            return self._glyphs[self._index[ch]]
+        except KeyError:
+            raise ValueError(f"Character {ch!r} not in glyph atlas: {self.path}") from None
+
+    def advance(self, ch: str, font_size: float) -> float:
+        """Advance width of ch at font_size."""
+        return float(self._record(ch)["advance"]) * font_size / self.reference_size
+
+    def contours(self, ch: str, font_size: float):
+        """Flattened contours of ch at font_size, as (K, 2) float arrays."""
+        rec = self._record(ch)
+        scale = font_size / self.reference_size
+        start = int(rec["contour_start"])
+        ranges = self._contours[start:start + int(rec["contour_count"])]
+        return [self._points[s:e].astype(np.float64) * scale for s, e in ranges]
+
+    def commands(self, ch: str, font_size: float):
+        """Outline commands of ch at font_size (see font_outline.skia_path_commands).
+
+        Returns None for glyphs without an outline.
+        """
+        rec = self._record(ch)
+        if int(rec["verb_count"]) == 0:
+            return None
+        scale = font_size / self.reference_size
+
+        start = int(rec["cmd_point_start"])
+        pts = (self._cmd_points[start:start + int(rec["cmd_point_count"])].astype(np.float64) * scale).tolist()
+
+        commands = []
+        i = 0
+        start = int(rec["verb_start"])
+        for verb in self._verbs[start:start + int(rec["verb_count"])].tolist():
+            n = _VERB_POINTS[verb]
+            commands.append((verb, [tuple(p) for p in pts[i:i + n]]))
+            i += n
+        return commands
+
+
+def load_atlas(path) -> GlyphAtlas:
+    """Open (once per process) the glyph atlas at path."""
+    return _open_atlas(str(Path(path).resolve()))
+
+
+@lru_cache(maxsize=None)
+def _open_atlas(path: str) -> GlyphAtlas:
+    return GlyphAtlas(Path(path))
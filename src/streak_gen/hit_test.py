@@ -0,0 +1,67 @@
+"""Quantized lookup grids for O(1) point-to-region hit-testing in clients.
+
+A grid covers the rendered page in square cells of `cell` points. Each cell
+holds the id of the region under its center (0 for none), in row-major order
+as uint8 when every id fits, else little-endian uint16. The bytes are zlib
+compressed (the "deflate" format of the browser DecompressionStream) and
+base64 encoded in a JSON sidecar:
+
+    {"width": 612, "height": 792, "cell": 2.0, "columns": 306, "rows": 396,
+     "dtype": "uint8", "compression": "zlib", "data": "<base64>"}
+
+Grids are mostly long runs of one id, so they compress to a few KB. After
+decoding, a click at page point (x, y) hits
+data[floor(y / cell) * columns + floor(x / cell)].
+"""
+import base64
+import json
+import zlib
+from pathlib import Path
+import numpy as np
+import shapely
+from .render_svg import LETTER_PAGE, fit_transform
+
+
+def build_lookup_grid(result, cell: float = 2.0, margin: float = 36.0, page_size=LETTER_PAGE) -> np.ndarray:
+    """Region ids on a grid of `cell`-point cells over the page, fitted like render_letter_svg.
+
+    Returns:
+        rows x columns uint16 array of region ids (0 where no region)
+    """
+    if cell <= 0:
+        raise ValueError(f"Grid cell size must be positive, got {cell}")
+    if len(result.regions) > np.iinfo(np.uint16).max:
+        raise ValueError(f"{len(result.regions)} regions do not fit in a uint16 lookup grid")
+
+    w, h = page_size
+    columns, rows = int(np.ceil(w / cell)), int(np.ceil(h / cell))
+    if not result.regions:
+        return np.zeros((rows, columns), dtype=np.uint16)
+
+    bounds = shapely.total_bounds([r.poly for r in result.regions])
+    scale, translate_x, translate_y = fit_transform(bounds, margin, page_size)
+
+    # Cell centers in page points, mapped back to geometry units
+    xs = ((np.arange(columns) + 0.5) * cell - translate_x) / scale
+    ys = ((np.arange(rows) + 0.5) * cell - translate_y) / scale
+    gx, gy = np.meshgrid(xs, ys)
+    ids = result.regions_at(np.column_stack([gx.ravel(), gy.ravel()]))
+    return ids.astype(np.uint16).reshape(rows, columns)
+
+
+def write_lookup_grid(result, out_path: Path, cell: float = 2.0, margin: float = 36.0, page_size=LETTER_PAGE):
+    """Write the lookup grid of a result as a JSON sidecar (see module docstring)."""
+    grid = build_lookup_grid(result, cell, margin, page_size)
+    rows, columns = grid.shape
+    dtype = "uint8" if grid.max(initial=0) <= np.iinfo(np.uint8).max else "uint16"
+    payload = zlib.compress(grid.astype(np.dtype(dtype).newbyteorder("<")).tobytes(), 9)
+    out_path.write_text(json.dumps({
+        "width": page_size[0],
+        "height": page_size[1],
+        "cell": cell,
+        "columns": columns,
+        "rows": rows,
+        "dtype": dtype,
+        "compression": "zlib",
+        "data": base64.b64encode(payload).decode("ascii"),
+    }), encoding="utf-8")
@@ -0,0 +1,139 @@
+"""Lay out streak sheets for an arbitrary date range over as many pages as needed."""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+from pathlib import Path
+from .layout_year import LAYOUT_FONT_SIZE, LAYOUT_INSET, LAYOUT_SCALE, MONTHS, layout_entry, paginate_entries, render_layout_page
+from .segmenter import segment_word_to_regions
+
+PERIODS = ("week", "month", "quarter")
+
+
+def _period_start(day: date, period: str) -> date:
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    return day.replace(month=3 * ((day.month - 1) // 3) + 1, day=1)
+
+
+def _period_word(day: date, period: str) -> str:
+    if period == "week":
+        return f"W{day.isocalendar().week}"
+    if period == "month":
+        return MONTHS[day.month - 1][0]
+    return f"Q{(day.month - 1) // 3 + 1}"
+
+
+def range_periods(start: date, end: date, period: str = "month"):
+    """Split the inclusive date range into periods, one word per period.
+
+    Periods cut by the range ends only count the days inside the range.
+
+    Returns:
+        list of (word, days, first_day) tuples in date order
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period: {period} (expected one of {', '.join(PERIODS)})")
+    if end < start:
+        raise ValueError(f"End date {end} is before start date {start}")
+
+    periods = []
+    day = start
+    while day <= end:
+        current = _period_start(day, period)
+        first_day = day
+        while day <= end and _period_start(day, period) == current:
+            day += timedelta(days=1)
+        periods.append((_period_word(first_day, period), (day - first_day).days, first_day))
+    return periods
+
+
+def _period_caption(first_day: date, days: int) -> str:
+    """Dates a period covers, e.g. "2026-01-01 – 2026-01-31"."""
+    last_day = first_day + timedelta(days=days - 1)
+    return first_day.isoformat() if days == 1 else f"{first_day.isoformat()} – {last_day.isoformat()}"
+
+
+def _segment_period(word: str, days: int, font_path: Path, atlas, backend: str, tolerance):
+    result = segment_word_to_regions(
+        word,
+        font_path,
+        days,
+        font_size=LAYOUT_FONT_SIZE,
+        inset=LAYOUT_INSET,
+        atlas=atlas,
+        backend=backend,
+        tolerance=tolerance,
+        output_scale=LAYOUT_SCALE,
+    )
+    # Build the lazy artifacts once here rather than in every page that shows this word
+    _ = result.glyph_outlines, result.labels
+    return result
+
+
+def _render_page(page_number: int, entries, out_dir: Path, tolerance) -> Path:
+    out_path = out_dir / f"page_{page_number:03d}.svg"
+    out_path.write_text(render_layout_page(entries, tolerance=tolerance), encoding="utf-8")
+    return out_path
+
+
+def layout_range(font_path: Path, out_dir: Path, start: date, end: date, period: str = "month",
+                 per_page: int = 12, workers: int | None = None, atlas=None, backend: str = "shapely",
+                 tolerance: float | None = None):
+    """Generate streak sheets covering start..end, one region per day.
+
+    Each unique (word, day count) pair is segmented once; pages are then laid out,
+    rendered and written in parallel, each as soon as it is finished. Words are
+    captioned with the dates they cover, and a page ends early when the next row
+    would run past its bottom margin.
+
+    Args:
+        font_path: Path to the font file
+        out_dir: Directory the page_NNN.svg files are written to
+        start, end: Inclusive date range
+        period: One word per "week", "month" or "quarter"
+        per_page: Maximum number of words per page
+        workers: Worker processes (defaults to the CPU count)
+        atlas: Optional GlyphAtlas to read glyph geometry from instead of the font file
+        backend: Geometry backend for inset and clipping
+        tolerance: Level of detail in output points (None keeps full detail)
+
+    Returns:
+        list of written page paths, in page order
+    """
+    periods = range_periods(start, end, period)
+    unique = list(dict.fromkeys((word, days) for word, days, _ in periods))
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"Segmenting {len(unique)} unique words for {len(periods)} {period}s...")
+    written = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_segment_period, word, days, font_path, atlas, backend, tolerance): (word, days)
+            for word, days in unique
+        }
+        results = {}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+        entries = [
+            layout_entry(word, days, results[(word, days)], caption=_period_caption(first_day, days))
+            for word, days, first_day in periods
+        ]
+        pages = paginate_entries(entries, per_page)
+        print(f"Rendering {len(pages)} pages...")
+        futures = {
+            pool.submit(
+                _render_page,
+                page_number,
+                page,
+                out_dir,
+                tolerance,
+            ): page_number
+            for page_number, page in enumerate(pages, start=1)
+        }
+        for future in as_completed(futures):
+            written[futures[future]] = future.result()
+            print(f"  ✓ {written[futures[future]]}")
+
+    return [written[n] for n in sorted(written)]
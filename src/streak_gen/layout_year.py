@@ -19,90 +19,140 @@ MONTHS = [
     ("DECEMBER", 31, 0),
 ]
 
-def layout_year(font_path: Path, out_path: Path):
-    """Generate all 12 months laid out on a letter-sized page in landscape."""
+# Letter size in landscape (11" x 8.5")
+PAGE_WIDTH = 792
+PAGE_HEIGHT = 612
+PAGE_MARGIN = 20
+LAYOUT_SCALE = 0.08  # Reduced to fit doubled font size
+LAYOUT_FONT_SIZE = 800.0  # Doubled again from 400.0
+LAYOUT_INSET = 4.0
+ENTRY_GAP = 20  # Gap between words on the page, in points
+CAPTION_SIZE = 10  # Caption font size, in points
+CAPTION_GAP = 4  # Space between a word and its caption, in points
 
-    # Letter size in landscape (11" x 8.5")
-    page_width = 792
-    page_height = 612
-    margin = 20
 
-    # Generate segmentation for all months
-    print("Generating month segmentations...")
-    month_data = []
-    for month_name, days, rotation in MONTHS:
-        print(f"  {month_name} ({days} days)...")
-        result = segment_word_to_regions(
-            month_name,
-            font_path,
-            days,
-            font_size=800.0,  # Doubled again from 400.0
-            inset=4.0
-        )
+def layout_entry(name: str, days: int, result, rotation: int = 0, caption: str | None = None):
+    """Collect a segmented word and its bounds for placement on a layout page.
+
+    caption, if given, is printed under the word (e.g. the dates it covers).
+    """
+    # Calculate bounds
+    all_bounds = [r.poly.bounds for r in result.regions]
+    min_x = min(b[0] for b in all_bounds)
+    min_y = min(b[1] for b in all_bounds)
+    max_x = max(b[2] for b in all_bounds)
+    max_y = max(b[3] for b in all_bounds)
+
+    return {
+        'name': name,
+        'days': days,
+        'result': result,
+        'bounds': (min_x, min_y, max_x, max_y),
+        'width': max_x - min_x,
+        'height': max_y - min_y,
+        'rotation': rotation,
+        'caption': caption,
+    }
+
 
-        # Calculate bounds
-        all_bounds = [r.poly.bounds for r in result.regions]
-        min_x = min(b[0] for b in all_bounds)
-        min_y = min(b[1] for b in all_bounds)
-        max_x = max(b[2] for b in all_bounds)
-        max_y = max(b[3] for b in all_bounds)
-
-        width = max_x - min_x
-        height = max_y - min_y
-
-        month_data.append({
-            'name': month_name,
-            'days': days,
-            'result': result,
-            'bounds': (min_x, min_y, max_x, max_y),
-            'width': width,
-            'height': height,
-            'rotation': rotation
-        })
-
-    # Calculate layout positions - left to right with wrapping
-    scale = 0.08  # Reduced to fit doubled font size
-    available_width = page_width - 2 * margin
-
-    # Calculate scaled widths for each month
-    scaled_widths = []
-    scaled_heights = []
-    for month in month_data:
-        scaled_widths.append(month['width'] * scale)
-        scaled_heights.append(month['height'] * scale)
-
-    # Place months left to right with wrapping
-    layout = []
+def _entry_size(entry, scale: float):
+    """Width and height of an entry on the page, including its caption."""
+    height = entry['height'] * scale
+    if entry.get('caption'):
+        height += CAPTION_GAP + CAPTION_SIZE
+    return entry['width'] * scale, height
+
+
+def _flow_entries(entries, page_width: float, page_height: float, margin: float, scale: float,
+                  per_page: int | None = None):
+    """Place entries left to right with wrapping, starting a new page when a row runs off the bottom.
+
+    A page always takes at least one entry, and at most per_page if given.
+
+    Returns:
+        list of (page_index, x, y) per entry, in page points
+    """
+    placed = []
+    page = 0
+    count = 0
     current_x = margin
     current_y = margin
     row_height = 0
-    gap = 20  # Increased gap between months
 
-    for i, (width, height) in enumerate(zip(scaled_widths, scaled_heights)):
-        # Check if month fits on current line
+    for entry in entries:
+        width, height = _entry_size(entry, scale)
+        # Check if entry fits on current line
         if current_x + width > page_width - margin and current_x > margin:
             # Move to next line
             current_x = margin
-            current_y += row_height + gap
+            current_y += row_height + ENTRY_GAP
+            row_height = 0
+
+        # Move to the next page if the page is full or the entry would run off it
+        if count and (count == per_page or current_y + height > page_height - margin):
+            page += 1
+            count = 0
+            current_x = margin
+            current_y = margin
             row_height = 0
 
-        # Place month at current position
-        layout.append((current_x, current_y, scale, 0))
+        placed.append((page, current_x, current_y))
+        count += 1
 
-        # Update position for next month
-        current_x += width + gap
+        # Update position for next entry
+        current_x += width + ENTRY_GAP
         row_height = max(row_height, height)
 
+    return placed
+
+
+def paginate_entries(entries, per_page: int | None = None, page_width: float = PAGE_WIDTH,
+                     page_height: float = PAGE_HEIGHT, margin: float = PAGE_MARGIN,
+                     scale: float = LAYOUT_SCALE):
+    """Split entries into pages that each fit within the page margins.
+
+    Args:
+        entries: list of dicts from layout_entry()
+        per_page: Optional cap on entries per page
+
+    Returns:
+        list of pages, each a list of entries in order
+    """
+    pages = []
+    for entry, (page, _, _) in zip(entries, _flow_entries(entries, page_width, page_height, margin, scale, per_page)):
+        if page == len(pages):
+            pages.append([])
+        pages[page].append(entry)
+    return pages
+
+
+def render_layout_page(entries, page_width: float = PAGE_WIDTH, page_height: float = PAGE_HEIGHT,
+                       margin: float = PAGE_MARGIN, scale: float = LAYOUT_SCALE,
+                       tolerance: float | None = None) -> str:
+    """Lay out segmented words left to right with wrapping and render them as one SVG page.
+
+    Args:
+        entries: list of dicts from layout_entry()
+        tolerance: If given, region paths are simplified to this many output points
+
+    Returns:
+        SVG document string
+    """
+    # Place entries left to right with wrapping, all on this page
+    layout = [(x, y, scale, 0) for _, x, y in _flow_entries(entries, page_width, float("inf"), margin, scale)]
+
     # Create SVG
-    print("Creating layout...")
     dwg = svgwrite.Drawing(size=(page_width, page_height))
     dwg.add(dwg.rect(insert=(0, 0), size=(page_width, page_height), fill="white"))
 
-    # Render each month
-    for i, month in enumerate(month_data):
+    # Each distinct glyph outline is defined once as a <symbol> and placed with <use>
+    glyph_symbols = {}
+
+    # Render each entry
+    for i, entry in enumerate(entries):
         x, y, scale, rotation = layout[i]
 
-        # Create group for this month with transform
+        # Create group for this entry with transform
         if rotation == 0:
             transform = f"translate({x}, {y}) scale({scale})"
         else:
@@ -112,9 +162,9 @@ def layout_year(font_path: Path, out_path: Path):
         g = dwg.g(transform=transform)
         dwg.add(g)
 
-        # Get month data
-        result = month['result']
-        min_x, min_y, max_x, max_y = month['bounds']
+        # Get entry data
+        result = entry['result']
+        min_x, min_y, max_x, max_y = entry['bounds']
 
         # Shift to origin
         shift_x = -min_x
@@ -126,8 +176,13 @@ def layout_year(font_path: Path, out_path: Path):
 
         # Add regions to inner group (no manual shift needed, transform handles it)
         for r in result.regions:
-            if r.poly.geom_type == 'MultiPolygon':
-                for poly in r.poly.geoms:
+            geom = r.poly
+            if tolerance:
+                # Drop vertices the print can't show
+                geom = geom.simplify(tolerance / scale, preserve_topology=True)
+
+            if geom.geom_type == 'MultiPolygon':
+                for poly in geom.geoms:
                     coords = list(poly.exterior.coords)
                     if coords:
                         path_parts = [f"M {coords[0][0]} {coords[0][1]}"]
@@ -137,7 +192,7 @@ def layout_year(font_path: Path, out_path: Path):
                         path_d = " ".join(path_parts)
                         inner_g.add(dwg.path(d=path_d, fill="none", stroke="gray", stroke_width=0.5))
             else:
-                coords = list(r.poly.exterior.coords)
+                coords = list(geom.exterior.coords)
                 if coords:
                     path_parts = [f"M {coords[0][0]} {coords[0][1]}"]
                     for cx, cy in coords[1:]:
@@ -146,8 +201,18 @@ def layout_year(font_path: Path, out_path: Path):
                     path_d = " ".join(path_parts)
                     inner_g.add(dwg.path(d=path_d, fill="none", stroke="gray", stroke_width=0.5))
 
-        # Add outline to inner group
-        inner_g.add(dwg.path(d=result.outline_path_svg, fill="none", stroke="navy", stroke_width=2))
+        # Add outline to inner group, one <use> per glyph (stroke is inherited by the symbol path)
+        outline_g = dwg.g(fill="none", stroke="navy", stroke_width=2)
+        inner_g.add(outline_g)
+        for path_d, x_offset in result.glyph_outlines:
+            symbol_id = glyph_symbols.get(path_d)
+            if symbol_id is None:
+                symbol_id = f"glyph-{len(glyph_symbols) + 1}"
+                glyph_symbols[path_d] = symbol_id
+                symbol = dwg.symbol(id=symbol_id, overflow="visible")
+                symbol.add(dwg.path(d=path_d))
+                dwg.defs.add(symbol)
+            outline_g.add(dwg.use(f"#{symbol_id}", transform=f"translate({x_offset}, 0)"))
 
         # Add labels with backgrounds to inner group
         for lab in result.labels:
@@ -171,9 +236,44 @@ def layout_year(font_path: Path, out_path: Path):
                           fill="black",
                           font_weight="bold"))
 
+        # Caption under the word, in page points
+        if entry.get('caption'):
+            dwg.add(dwg.text(entry['caption'], insert=(x, y + entry['height'] * scale + CAPTION_GAP + CAPTION_SIZE),
+                             font_size=f"{CAPTION_SIZE}px", fill="black"))
+
+    return dwg.tostring()
+
+
+def layout_year(font_path: Path, out_path: Path, atlas=None, tolerance: float | None = None):
+    """Generate all 12 months laid out on a letter-sized page in landscape.
+
+    If a GlyphAtlas is given, glyph geometry is read from it instead of the font file.
+    tolerance (in output points) bounds vertex counts from curve flattening to the
+    rendered paths, so geometry cost follows the print scale rather than the font size.
+    """
+    # Generate segmentation for all months
+    print("Generating month segmentations...")
+    month_data = []
+    for month_name, days, rotation in MONTHS:
+        print(f"  {month_name} ({days} days)...")
+        result = segment_word_to_regions(
+            month_name,
+            font_path,
+            days,
+            font_size=LAYOUT_FONT_SIZE,
+            inset=LAYOUT_INSET,
+            atlas=atlas,
+            tolerance=tolerance,
+            output_scale=LAYOUT_SCALE,
+        )
+        month_data.append(layout_entry(month_name, days, result, rotation))
+
+    print("Creating layout...")
+    svg_text = render_layout_page(month_data, tolerance=tolerance)
+
     # Save
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with open(out_path, 'w') as f:
-        f.write(dwg.tostring())
+        f.write(svg_text)
 
     print(f"✓ Year layout saved to {out_path}")
@@ -0,0 +1,160 @@
+"""Tiled poster output: split a large segmentation into printable, overlapping pages."""
+import math
+from pathlib import Path
+import shapely
+import svgwrite
+from shapely.geometry import box
+from .render_svg import LETTER_PAGE
+
+REGISTRATION_MARK_SIZE = 9.0  # Radius of the corner registration marks, in points
+LABEL_FONT_SIZE = 14.0  # Label size on the printed tile, in points
+OUTLINE_STROKE = 4.0  # Width of the glyph outline on the poster, in points
+
+
+def _exterior_paths(geom):
+    """SVG path strings of the exterior ring(s) of a Polygon or MultiPolygon."""
+    paths = []
+    for poly in getattr(geom, "geoms", [geom]):
+        coords = list(poly.exterior.coords)
+        if coords:
+            path_parts = [f"M {coords[0][0]} {coords[0][1]}"]
+            for x, y in coords[1:]:
+                path_parts.append(f"L {x} {y}")
+            path_parts.append("Z")
+            paths.append(" ".join(path_parts))
+    return paths
+
+
+def _registration_mark(dwg, x, y):
+    mark = dwg.g(stroke="black", stroke_width=0.5, fill="none")
+    mark.add(dwg.circle(center=(x, y), r=REGISTRATION_MARK_SIZE / 2))
+    mark.add(dwg.line(start=(x - REGISTRATION_MARK_SIZE, y), end=(x + REGISTRATION_MARK_SIZE, y)))
+    mark.add(dwg.line(start=(x, y - REGISTRATION_MARK_SIZE), end=(x, y + REGISTRATION_MARK_SIZE)))
+    return mark
+
+
+def poster_grid(bounds, poster_width: float, tile_size=LETTER_PAGE, margin: float = 36.0, overlap: float = 18.0,
+                pad: float = OUTLINE_STROKE / 2):
+    """Work out the scale and tile grid for a poster of the given width (in points).
+
+    The artwork is bounds plus pad points on every side (half the outline stroke
+    by default), so the whole outline fits inside poster_width.
+
+    Returns:
+        (scale, columns, rows)
+    """
+    if poster_width <= 2 * pad:
+        raise ValueError(f"Poster width must be more than {2 * pad} points, got {poster_width}")
+    min_x, min_y, max_x, max_y = bounds
+    scale = (poster_width - 2 * pad) / (max_x - min_x)
+    poster_height = (max_y - min_y) * scale + 2 * pad
+
+    printable_w = tile_size[0] - 2 * margin
+    printable_h = tile_size[1] - 2 * margin
+    if overlap >= min(printable_w, printable_h):
+        raise ValueError(f"Overlap {overlap} must be smaller than the printable tile area")
+
+    columns = max(1, math.ceil((poster_width - overlap) / (printable_w - overlap)))
+    rows = max(1, math.ceil((poster_height - overlap) / (printable_h - overlap)))
+    return scale, columns, rows
+
+
+def render_poster_tiles(result, out_dir: Path, poster_width: float, tile_size=LETTER_PAGE,
+                        margin: float = 36.0, overlap: float = 18.0, tolerance: float | None = None):
+    """Render a segmentation as a grid of printable tiles, writing each tile as it is done.
+
+    Tiles share `overlap` points with their neighbours and carry registration marks
+    at the corners of their printable area. Regions and labels for each tile are
+    found through spatial indexes, so only one tile is ever built in memory.
+
+    Args:
+        result: SegmentationResult to print
+        out_dir: Directory the tile_rRR_cCC.svg files are written to
+        poster_width: Printed width of the poster, in points
+        tile_size: (width, height) of each printed page, in points
+        margin: Unprintable page margin, in points
+        overlap: Overlap between neighbouring tiles, in points
+        tolerance: If given, region paths are simplified to this many output points
+
+    Yields:
+        Path of each tile, in row-major order
+    """
+    # Fit the glyph outline, which runs outside the inset segmentation polygon
+    bounds = result.outline_bounds or result.segmentation_poly.bounds
+    min_x, min_y, _, _ = bounds
+    pad = OUTLINE_STROKE / 2
+    scale, columns, rows = poster_grid(bounds, poster_width, tile_size, margin, overlap, pad)
+
+    tile_w, tile_h = tile_size
+    printable_w = tile_w - 2 * margin
+    printable_h = tile_h - 2 * margin
+
+    region_geoms = [r.poly for r in result.regions]
+    region_tree = shapely.STRtree(region_geoms)
+    labels = result.labels
+    label_tree = shapely.STRtree([lab.point for lab in labels])
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for row in range(rows):
+        for col in range(columns):
+            # Tile window in poster points, then in geometry units
+            x0 = col * (printable_w - overlap)
+            y0 = row * (printable_h - overlap)
+            window = box(
+                min_x + (x0 - pad) / scale,
+                min_y + (y0 - pad) / scale,
+                min_x + (x0 + printable_w - pad) / scale,
+                min_y + (y0 + printable_h - pad) / scale,
+            )
+
+            dwg = svgwrite.Drawing(size=tile_size)
+            dwg.add(dwg.rect(insert=(0, 0), size=tile_size, fill="white"))
+
+            clip = dwg.defs.add(dwg.clipPath(id="printable"))
+            clip.add(dwg.rect(insert=(margin, margin), size=(printable_w, printable_h)))
+
+            # Geometry -> tile transform
+            transform = (f"translate({margin + pad - x0}, {margin + pad - y0}) "
+                         f"scale({scale}) translate({-min_x}, {-min_y})")
+            clipped_g = dwg.g(clip_path="url(#printable)")
+            dwg.add(clipped_g)
+            g = dwg.g(transform=transform)
+            clipped_g.add(g)
+
+            for i in region_tree.query(window).tolist():
+                geom = region_geoms[i]
+                if tolerance:
+                    # Drop vertices the print can't show
+                    geom = geom.simplify(tolerance / scale, preserve_topology=True)
+                for path_d in _exterior_paths(geom):
+                    g.add(dwg.path(d=path_d, fill="none", stroke="gray", stroke_width=1 / scale))
+
+            g.add(dwg.path(d=result.outline_path_svg, fill="none", stroke="black", stroke_width=OUTLINE_STROKE / scale))
+
+            for i in label_tree.query(window).tolist():
+                lab = labels[i]
+                text_width = len(lab.text) * LABEL_FONT_SIZE * 0.6 / scale
+                text_height = LABEL_FONT_SIZE / scale
+                g.add(dwg.rect(
+                    insert=(lab.point.x - text_width / 2, lab.point.y - text_height / 2),
+                    size=(text_width, text_height),
+                    fill="white",
+                    opacity=0.8
+                ))
+                g.add(dwg.text(lab.text, insert=(lab.point.x, lab.point.y),
+                               font_size=f"{LABEL_FONT_SIZE / scale}px",
+                               text_anchor="middle",
+                               dominant_baseline="middle",
+                               fill="black",
+                               font_weight="bold"))
+
+            # Registration marks on the printable corners, and the tile position
+            for x, y in ((margin, margin), (tile_w - margin, margin),
+                         (margin, tile_h - margin), (tile_w - margin, tile_h - margin)):
+                dwg.add(_registration_mark(dwg, x, y))
+            dwg.add(dwg.text(f"row {row + 1}/{rows}, column {col + 1}/{columns}",
+                             insert=(margin, margin / 2), font_size="9px", fill="gray"))
+
+            out_path = out_dir / f"tile_r{row + 1:02d}_c{col + 1:02d}.svg"
+            out_path.write_text(dwg.tostring(), encoding="utf-8")
+            yield out_path
@@ -1,4 +1,5 @@
 import svgwrite
+from .coloring import palette_fills
 from .types import Region, Label
 
 def polygon_to_svg_path(geom):
@@ -38,20 +39,18 @@ def polygon_to_svg_path(geom):
     return single_polygon_to_path(geom)
 
 
-def render_letter_svg(page, margin, outline_path_svg, regions, labels, voronoi_edges=None):
-    # Page dimensions (US Letter size in points)
-    w, h = (612, 792)
+# US Letter size in points
+LETTER_PAGE = (612, 792)
 
-    # Calculate bounding box from all regions
-    if not regions:
-        # Fallback if no regions
-        min_x, min_y, max_x, max_y = 0, 0, w, h
-    else:
-        all_bounds = [r.poly.bounds for r in regions]
-        min_x = min(b[0] for b in all_bounds)
-        min_y = min(b[1] for b in all_bounds)
-        max_x = max(b[2] for b in all_bounds)
-        max_y = max(b[3] for b in all_bounds)
+
+def fit_transform(bounds, margin, page_size=LETTER_PAGE):
+    """Uniform scale and translation that center bounds on the page within margin.
+
+    Returns:
+        (scale, translate_x, translate_y)
+    """
+    w, h = page_size
+    min_x, min_y, max_x, max_y = bounds
 
     # Calculate dimensions
     glyph_width = max_x - min_x
@@ -72,10 +71,48 @@ def render_letter_svg(page, margin, outline_path_svg, regions, labels, voronoi_e
     scaled_height = glyph_height * scale
     translate_x = margin + (available_width - scaled_width) / 2 - min_x * scale
     translate_y = margin + (available_height - scaled_height) / 2 - min_y * scale
+    return scale, translate_x, translate_y
+
+
+def render_letter_svg(page, margin, outline_path_svg, regions, labels, voronoi_edges=None,
+                      region_stroke="gray", outline_stroke="black", palette=None, adjacency=None,
+                      tolerance=None, region_ids=False, style=None):
+    """Render segmented regions, outline and labels fitted onto a US Letter page.
+
+    If a palette is given, regions are filled with its colors so that adjacent
+    regions (per the adjacency graph, e.g. SegmentationResult.adjacency) differ.
+    If tolerance (in output points) is given, region paths are simplified to it
+    before serialization. With region_ids, every region is one fillable path
+    with id "region-<id>", and style is added as a <style> sheet (see fill_overlay).
+    """
+    fills = None
+    if palette:
+        if adjacency is None:
+            raise ValueError("Coloring regions with a palette requires their adjacency graph")
+        fills = palette_fills(adjacency, palette)
+
+    # Page dimensions (US Letter size in points)
+    w, h = LETTER_PAGE
+
+    # Calculate bounding box from all regions
+    if not regions:
+        # Fallback if no regions
+        bounds = (0, 0, w, h)
+    else:
+        all_bounds = [r.poly.bounds for r in regions]
+        bounds = (
+            min(b[0] for b in all_bounds),
+            min(b[1] for b in all_bounds),
+            max(b[2] for b in all_bounds),
+            max(b[3] for b in all_bounds),
+        )
+    scale, translate_x, translate_y = fit_transform(bounds, margin, LETTER_PAGE)
 
     # Create SVG
     dwg = svgwrite.Drawing(size=(w, h))
     dwg.add(dwg.rect(insert=(0, 0), size=(w, h), fill="white"))
+    if style is not None:
+        dwg.defs.add(dwg.style(style))
 
     # Create a group with transformation
     transform = f"translate({translate_x}, {translate_y}) scale({scale}, {scale})"
@@ -84,6 +121,18 @@ def render_letter_svg(page, margin, outline_path_svg, regions, labels, voronoi_e
 
     # Render each region boundary (only exterior, not interior holes)
     for r in regions:
+        if tolerance:
+            # Drop vertices the print can't show
+            r = Region(id=r.id, poly=r.poly.simplify(tolerance / scale, preserve_topology=True))
+
+        if fills is not None or region_ids:
+            # Filled regions need their holes cut out
+            extra = {"id": f"region-{r.id}"} if region_ids else {}
+            fill = fills.get(r.id, "none") if fills is not None else "none"
+            g.add(dwg.path(d=polygon_to_svg_path(r.poly), fill=fill, fill_rule="evenodd",
+                           stroke=region_stroke, stroke_width=1/scale, **extra))
+            continue
+
         # Handle both Polygon and MultiPolygon
         if r.poly.geom_type == 'MultiPolygon':
             # For MultiPolygon, render exterior of each polygon
@@ -95,7 +144,7 @@ def render_letter_svg(page, margin, outline_path_svg, regions, labels, voronoi_e
                         path_parts.append(f"L {x} {y}")
                     path_parts.append("Z")
                     path_d = " ".join(path_parts)
-                    g.add(dwg.path(d=path_d, fill="none", stroke="gray", stroke_width=1/scale))
+                    g.add(dwg.path(d=path_d, fill="none", stroke=region_stroke, stroke_width=1/scale))
         else:
             # Single Polygon - only render exterior ring, not holes
             coords = list(r.poly.exterior.coords)
@@ -105,10 +154,10 @@ def render_letter_svg(page, margin, outline_path_svg, regions, labels, voronoi_e
                     path_parts.append(f"L {x} {y}")
                 path_parts.append("Z")
                 path_d = " ".join(path_parts)
-                g.add(dwg.path(d=path_d, fill="none", stroke="gray", stroke_width=1/scale))
+                g.add(dwg.path(d=path_d, fill="none", stroke=region_stroke, stroke_width=1/scale))
 
     # Add the letter outline on top
-    g.add(dwg.path(d=outline_path_svg, fill="none", stroke="black", stroke_width=4/scale))
+    g.add(dwg.path(d=outline_path_svg, fill="none", stroke=outline_stroke, stroke_width=4/scale))
 
     # Add labels LAST with white background so they're always visible
     for lab in labels:
@@ -0,0 +1,102 @@
+"""Repair pass that guarantees exactly one non-empty region per seed.
+
+Clipping Voronoi cells to the glyph can lose cells (empty or zero-area) or
+split them (a cell spanning two letters becomes a MultiPolygon). Both are fixed
+directly on the clipped polygons, without building another diagram: a lost
+cell takes half of the largest region among its seed's nearest seeds, so the
+day stays where its seed was, and a split cell keeps its largest piece
+and hands each other piece to the smallest region sharing a border with it.
+
+Repaired regions are no longer exactly the Voronoi cells of their seeds, which
+is why SegmentationResult.adjacency is taken from the region polygons.
+"""
+import numpy as np
+import shapely
+from scipy.spatial import cKDTree
+from shapely.geometry import MultiPolygon, Polygon, box
+
+# Nearest seeds a lost cell may take its region from
+DONOR_NEIGHBOURS = 8
+
+
+def _polygonal(geom):
+    """Keep only the polygon parts of geom (drops stray lines/points from clipping)."""
+    if geom.geom_type in ("Polygon", "MultiPolygon"):
+        return geom
+    parts = [p for p in shapely.get_parts(geom) if p.geom_type == "Polygon" and p.area > 0]
+    if not parts:
+        return Polygon()
+    return parts[0] if len(parts) == 1 else MultiPolygon(parts)
+
+
+def _is_lost(geom) -> bool:
+    return geom.is_empty or not geom.is_valid or geom.area <= 0
+
+
+def _bisect(region):
+    """Cut region in two through its centroid, across its longer side."""
+    minx, miny, maxx, maxy = region.bounds
+    c = region.centroid
+    if maxx - minx >= maxy - miny:
+        halves = box(minx, miny, c.x, maxy), box(c.x, miny, maxx, maxy)
+    else:
+        halves = box(minx, miny, maxx, c.y), box(minx, c.y, maxx, maxy)
+    return [_polygonal(region.intersection(h)) for h in halves]
+
+
+def _merge_split_parts(clipped, i):
+    """Keep the largest part of a split cell and merge the others into the smallest bordering region."""
+    parts = sorted(clipped[i].geoms, key=lambda p: p.area, reverse=True)
+    clipped[i] = parts[0]
+    tree = shapely.STRtree(clipped)
+    for part in parts[1:]:
+        best = None
+        for m in tree.query(part, predicate="intersects").tolist():
+            if m == i or part.boundary.intersection(clipped[m].boundary).length <= 0:
+                continue
+            if best is None or clipped[m].area < clipped[best].area:
+                best = m
+        if best is None:
+            # Isolated piece (nothing to merge with), it stays with its own cell
+            clipped[i] = clipped[i].union(part)
+        else:
+            clipped[best] = _polygonal(clipped[best].union(part))
+
+
+def _donor(clipped, candidates):
+    """Largest non-lost region among candidates, or None."""
+    candidates = [i for i in candidates if not _is_lost(clipped[i])]
+    return max(candidates, key=lambda i: clipped[i].area) if candidates else None
+
+
+def repair_cells(pts, clipped):
+    """Fix lost and split cells so every seed has exactly one non-empty region.
+
+    Args:
+        pts: Nx2 seed points
+        clipped: N clipped cells aligned with pts
+
+    Returns:
+        (pts, clipped) with every cell non-empty and, where possible, a single Polygon
+    """
+    pts = np.array(pts, dtype=np.float64)
+    clipped = [_polygonal(c) for c in clipped]
+
+    # Lost cells split the largest region among their nearest seeds (anywhere, if all
+    # of those are lost too); the donor's seed and the lost one move into the halves
+    lost = [i for i, c in enumerate(clipped) if _is_lost(c)]
+    tree = cKDTree(pts) if lost else None
+    for j in lost:
+        _, neighbours = tree.query(pts[j], k=min(DONOR_NEIGHBOURS + 1, len(pts)))
+        k = _donor(clipped, np.atleast_1d(neighbours).tolist())
+        if k is None:
+            k = _donor(clipped, range(len(clipped)))
+        clipped[k], clipped[j] = _bisect(clipped[k])
+        for i in (j, k):
+            pts[i] = clipped[i].representative_point().coords[0]
+
+    for i, cell in enumerate(clipped):
+        if cell.geom_type == "MultiPolygon":
+            _merge_split_parts(clipped, i)
+
+    return pts, clipped
@@ -1,48 +1,30 @@
+from collections import defaultdict
+from functools import partial
 from pathlib import Path
 import numpy as np
-from shapely.geometry import Point, Polygon, LineString
-from .types import Region, Label, SegmentationResult
-from .font_outline import glyph_outline_svg_path, skia_path_to_polygon, word_outline_svg_path
-from .seeds import random_points_in_polygon
+from .types import Region, SegmentationResult
+from .font_outline import letter_polygon, letter_svg_path, text_glyph_outlines, word_polygons, word_svg_path
+from .geometry_backend import clip_cells, inset_polygon
+from .repair import repair_cells
+from .seeds import SEED_METHODS, seed_points
 from .voronoi import voronoi_cells
-import pyclipper
-from scipy.spatial import Voronoi
 
-def segment_letter_to_regions(letter: str, font_path: Path, segments: int, font_size: float, inset: float):
-    # Get letter outline and convert to polygon
-    outline_d, glyph_path = glyph_outline_svg_path(letter, font_path, font_size)
-    glyph_poly = skia_path_to_polygon(glyph_path)
 
-    # Apply inset to the letter polygon (shrink it slightly)
-    # The buffer operation with negative value will automatically handle both:
-    # - Shrinking the exterior boundary
-    # - Expanding the holes (interior rings)
-    if inset > 0:
-        # Negative buffer shrinks exterior and expands holes
-        inset_poly = glyph_poly.buffer(-inset)
-
-        # Clean up geometry
-        if not inset_poly.is_valid or inset_poly.is_empty:
-            inset_poly = glyph_poly.buffer(-inset * 0.5)  # Try with less aggressive inset
-    else:
-        inset_poly = glyph_poly
-
-    # Generate random seed points within the inset polygon
-    rng = np.random.default_rng(0)
-    pts = random_points_in_polygon(inset_poly, segments, rng)
+def _relax_seeds(pts, inset_poly, iterations: int, backend: str):
+    """Apply Lloyd's relaxation to improve spatial distribution.
 
-    # Apply Lloyd's relaxation to improve spatial distribution
-    # This moves seeds toward the centroid of their Voronoi cells
-    for iteration in range(3):  # 3 iterations usually enough
+    This moves seeds toward the centroid of their Voronoi cells.
+    """
+    for iteration in range(iterations):
         bbox = inset_poly.bounds
-        cells = voronoi_cells(pts, bbox)
+        cells, fallback = voronoi_cells(pts, bbox)
 
         new_pts = []
-        for i, cell in enumerate(cells):
-            # Clip cell to polygon
-            clipped = cell.intersection(inset_poly)
-
-            if clipped.is_valid and not clipped.is_empty and clipped.area > 0:
+        for i, clipped in enumerate(clip_cells(cells, inset_poly, backend)):
+            if fallback[i]:
+                # Cell is the bbox stand-in, its centroid says nothing about this seed
+                new_pts.append(pts[i])
+            elif clipped.is_valid and not clipped.is_empty and clipped.area > 0:
                 # Move seed to centroid of clipped cell
                 centroid = clipped.centroid
                 # Check if centroid is inside the polygon
@@ -56,45 +38,82 @@ def segment_letter_to_regions(letter: str, font_path: Path, segments: int, font_
                 new_pts.append(pts[i])
 
         pts = np.array(new_pts)
+    return pts
+
+
+def _geometry_tolerance(tolerance, output_scale: float):
+    """Convert a tolerance in output units to font units (None disables level of detail)."""
+    return tolerance / output_scale if tolerance else None
+
+
+def _lod_inset(glyph_poly, inset: float, backend: str, tolerance):
+    """Inset the glyph polygon, then simplify it to tolerance (font units) before clipping."""
+    # The offset shrinks the exterior boundary and expands the holes (interior rings)
+    inset_poly = inset_polygon(glyph_poly, inset, backend)
+    if tolerance:
+        inset_poly = inset_poly.simplify(tolerance, preserve_topology=True)
+    return inset_poly
+
+
+def _tessellate(inset_poly, segments: int, seed_method: str, relax_iterations: int | None, backend: str,
+                repair: bool):
+    """Seed inset_poly, relax the seeds and clip their Voronoi cells to it.
+
+    Returns:
+        (pts, clipped_cells) with one clipped cell per seed
+    """
+    if segments == 1:
+        # A single region is the whole polygon, there is no diagram to build
+        return np.array([inset_poly.representative_point().coords[0]]), [inset_poly]
+
+    # Generate seed points within the inset polygon
+    rng = np.random.default_rng(0)
+    pts = seed_points(inset_poly, segments, rng, seed_method)
+    if relax_iterations is None:
+        relax_iterations = SEED_METHODS[seed_method][1]
+
+    # Apply Lloyd's relaxation, 3 iterations usually enough for random seeds
+    pts = _relax_seeds(pts, inset_poly, relax_iterations, backend)
 
     # Compute final Voronoi cells with relaxed points
     bbox = inset_poly.bounds  # (minx, miny, maxx, maxy)
-    cells = voronoi_cells(pts, bbox)
+    cells, _ = voronoi_cells(pts, bbox)
 
-    # Also compute Voronoi diagram to extract edges
-    vor = Voronoi(pts)
+    # Clip each Voronoi cell to the inset boundary
+    clipped_cells = clip_cells(cells, inset_poly, backend)
+    if repair:
+        # Fix lost or split cells so there are exactly `segments` single-polygon regions
+        pts, clipped_cells = repair_cells(pts, clipped_cells)
+    return pts, clipped_cells
 
-    # Extract Voronoi edges that lie within the polygon
-    voronoi_edges = []
-    for ridge_vertices in vor.ridge_vertices:
-        if -1 not in ridge_vertices:  # Skip infinite ridges
-            p1 = vor.vertices[ridge_vertices[0]]
-            p2 = vor.vertices[ridge_vertices[1]]
-            edge = LineString([(p1[0], p1[1]), (p2[0], p2[1])])
 
-            # Clip edge to the inset polygon
-            clipped_edge = edge.intersection(inset_poly)
-            if not clipped_edge.is_empty and clipped_edge.geom_type == 'LineString':
-                voronoi_edges.append(clipped_edge)
+def segment_letter_to_regions(letter: str, font_path: Path, segments: int, font_size: float, inset: float,
+                              atlas=None, backend: str = "shapely", tolerance: float | None = None,
+                              output_scale: float = 1.0, seed_method: str = "random",
+                              relax_iterations: int | None = None, repair: bool = True):
+    # Flattening and simplification tolerance in font units
+    geom_tolerance = _geometry_tolerance(tolerance, output_scale)
 
-    # Clip each Voronoi cell to the inset letter boundary
-    temp_regions = []
-    for i in range(len(cells)):
-        cell = cells[i]
-        seed_pt = pts[i]
+    # Get letter polygon (from the glyph atlas if one is given)
+    # The SVG outline is only built if the result's outline_path_svg is used
+    glyph_poly = letter_polygon(letter, font_path, font_size, atlas=atlas, tolerance=geom_tolerance)
+
+    # Apply inset to the letter polygon (shrink it slightly)
+    inset_poly = _lod_inset(glyph_poly, inset, backend, geom_tolerance)
 
-        # Clip cell to letter polygon
-        clipped = cell.intersection(inset_poly)
+    # Seed, relax and clip the Voronoi cells to the inset boundary
+    pts, clipped_cells = _tessellate(inset_poly, segments, seed_method, relax_iterations, backend, repair)
 
+    temp_regions = []
+    for i, clipped in enumerate(clipped_cells):
         # Only keep valid polygons
         if clipped.is_valid and not clipped.is_empty and clipped.area > 0:
             # Store region with its centroid for sorting
             centroid = clipped.centroid
             temp_regions.append({
                 'poly': clipped,
-                'seed_pt': seed_pt,
                 'centroid': centroid,
-                'index': i  # Keep track of original index
+                'index': i  # Keep track of original seed index
             })
 
     # Keep all regions - no merging
@@ -104,32 +123,24 @@ def segment_letter_to_regions(letter: str, font_path: Path, segments: int, font_
     temp_regions.sort(key=lambda r: (r['centroid'].y, r['centroid'].x))
 
     # Now assign IDs based on sorted order
-    regions = []
-    labels = []
-    for i, region_data in enumerate(temp_regions):
-        clipped = region_data['poly']
-        seed_pt = region_data['seed_pt']
-
-        regions.append(Region(id=i + 1, poly=clipped))
-
-        # Place label at representative point inside the clipped region
-        # Use the seed point if it's inside, otherwise use representative_point
-        label_pt = Point(seed_pt[0], seed_pt[1])
-        if not clipped.contains(label_pt):
-            label_pt = clipped.representative_point()
-        labels.append(Label(id=i + 1, point=label_pt, text=str(i + 1)))
-
-    # Return the segmentation result
+    regions = [Region(id=i + 1, poly=r['poly']) for i, r in enumerate(temp_regions)]
+
+    # Return the segmentation result; labels, edges and the outline are derived lazily
     return SegmentationResult(
-        outline_path_svg=outline_d,
         segmentation_poly=inset_poly,
         regions=regions,
-        labels=labels,
-        voronoi_edges=voronoi_edges
+        seed_points=pts,
+        region_seeds=np.array([r['index'] for r in temp_regions], dtype=np.intp),
+        outline_source=partial(letter_svg_path, letter, font_path, font_size, atlas=atlas),
+        glyph_source=partial(text_glyph_outlines, letter[:1], font_path, font_size, atlas=atlas),
+        outline_bounds=glyph_poly.bounds,
     )
 
 
-def segment_word_to_regions(word: str, font_path: Path, segments: int, font_size: float, inset: float):
+def segment_word_to_regions(word: str, font_path: Path, segments: int, font_size: float, inset: float,
+                            atlas=None, backend: str = "shapely", tolerance: float | None = None,
+                            output_scale: float = 1.0, seed_method: str = "random",
+                            relax_iterations: int | None = None, repair: bool = True):
     """Segment a word into N regions using Voronoi tessellation.
 
     Args:
@@ -138,80 +149,33 @@ def segment_word_to_regions(word: str, font_path: Path, segments: int, font_size
         segments: Number of regions to create
         font_size: Font size in points
         inset: Amount to inset the boundary
+        atlas: Optional GlyphAtlas to read glyph geometry from instead of the font file
+        backend: Geometry backend for inset and clipping ("shapely" or "pyclipper")
+        tolerance: Level of detail in output units; drives adaptive curve flattening and
+            simplification of the inset polygon (None keeps full detail)
+        output_scale: Output units per font unit, used to convert tolerance
+        seed_method: Seed initializer, see seeds.SEED_METHODS
+        relax_iterations: Lloyd iterations (defaults to what seed_method needs)
+        repair: Repair lost or split cells so exactly `segments` regions come back
 
     Returns:
         SegmentationResult with regions distributed across the entire word
     """
-    # Get word outline and individual letter polygons
-    outline_d, word_poly, letter_polygons = word_outline_svg_path(word, font_path, font_size)
+    # Flattening and simplification tolerance in font units
+    geom_tolerance = _geometry_tolerance(tolerance, output_scale)
 
-    # Apply inset to the word polygon (shrink it slightly)
-    # The buffer operation with negative value will automatically handle both:
-    # - Shrinking the exterior boundary
-    # - Expanding the holes (interior rings)
-    if inset > 0:
-        # Negative buffer shrinks exterior and expands holes
-        inset_poly = word_poly.buffer(-inset)
-
-        # Clean up geometry
-        if not inset_poly.is_valid or inset_poly.is_empty:
-            inset_poly = word_poly.buffer(-inset * 0.5)  # Try with less aggressive inset
-    else:
-        inset_poly = word_poly
-
-    # Generate random seed points within the inset polygon
-    rng = np.random.default_rng(0)
-    pts = random_points_in_polygon(inset_poly, segments, rng)
+    # Get word polygon and individual letter polygons
+    # The SVG outline is only built if the result's outline_path_svg is used
+    word_poly, letter_polygons = word_polygons(word, font_path, font_size, atlas=atlas, tolerance=geom_tolerance)
 
-    # Apply Lloyd's relaxation to improve spatial distribution
-    for iteration in range(3):
-        bbox = inset_poly.bounds
-        cells = voronoi_cells(pts, bbox)
-
-        new_pts = []
-        for i, cell in enumerate(cells):
-            clipped = cell.intersection(inset_poly)
-
-            if clipped.is_valid and not clipped.is_empty and clipped.area > 0:
-                centroid = clipped.centroid
-                if inset_poly.contains(centroid):
-                    new_pts.append([centroid.x, centroid.y])
-                else:
-                    new_pts.append(pts[i])
-            else:
-                new_pts.append(pts[i])
-
-        pts = np.array(new_pts)
-
-    # Compute final Voronoi cells with relaxed points
-    bbox = inset_poly.bounds  # (minx, miny, maxx, maxy)
-    cells = voronoi_cells(pts, bbox)
-
-    # Also compute Voronoi diagram to extract edges
-    vor = Voronoi(pts)
-
-    # Extract Voronoi edges that lie within the polygon
-    voronoi_edges = []
-    for ridge_vertices in vor.ridge_vertices:
-        if -1 not in ridge_vertices:  # Skip infinite ridges
-            p1 = vor.vertices[ridge_vertices[0]]
-            p2 = vor.vertices[ridge_vertices[1]]
-            edge = LineString([(p1[0], p1[1]), (p2[0], p2[1])])
+    # Apply inset to the word polygon (shrink it slightly)
+    inset_poly = _lod_inset(word_poly, inset, backend, geom_tolerance)
 
-            # Clip edge to the inset polygon
-            clipped_edge = edge.intersection(inset_poly)
-            if not clipped_edge.is_empty and clipped_edge.geom_type == 'LineString':
-                voronoi_edges.append(clipped_edge)
+    # Seed, relax and clip the Voronoi cells to the inset boundary
+    pts, clipped_cells = _tessellate(inset_poly, segments, seed_method, relax_iterations, backend, repair)
 
-    # Clip each Voronoi cell to the inset word boundary
     temp_regions = []
-    for i in range(len(cells)):
-        cell = cells[i]
-        seed_pt = pts[i]
-
-        # Clip cell to word polygon
-        clipped = cell.intersection(inset_poly)
-
+    for i, clipped in enumerate(clipped_cells):
         # Only keep valid polygons
         if clipped.is_valid and not clipped.is_empty and clipped.area > 0:
             # Store region with its centroid for sorting
@@ -229,15 +193,14 @@ def segment_word_to_regions(word: str, font_path: Path, segments: int, font_size
 
             temp_regions.append({
                 'poly': clipped,
-                'seed_pt': seed_pt,
                 'centroid': centroid,
+                'index': i,
                 'letter_idx': letter_idx
             })
 
     # Keep all regions - no merging
 
     # Group regions by letter
-    from collections import defaultdict
     regions_by_letter = defaultdict(list)
     for region_data in temp_regions:
         regions_by_letter[region_data['letter_idx']].append(region_data)
@@ -248,30 +211,16 @@ def segment_word_to_regions(word: str, font_path: Path, segments: int, font_size
         regions_by_letter[letter_idx].sort(key=lambda r: (r['centroid'].y, r['centroid'].x))
 
     # Now assign IDs letter-by-letter in order
-    regions = []
-    labels = []
-    region_id = 1
-
-    for letter_idx in sorted(regions_by_letter.keys()):
-        for region_data in regions_by_letter[letter_idx]:
-            clipped = region_data['poly']
-            seed_pt = region_data['seed_pt']
-
-            regions.append(Region(id=region_id, poly=clipped))
-
-            # Place label at representative point inside the clipped region
-            label_pt = Point(seed_pt[0], seed_pt[1])
-            if not clipped.contains(label_pt):
-                label_pt = clipped.representative_point()
-            labels.append(Label(id=region_id, point=label_pt, text=str(region_id)))
-
-            region_id += 1
+    ordered = [r for letter_idx in sorted(regions_by_letter.keys()) for r in regions_by_letter[letter_idx]]
+    regions = [Region(id=i + 1, poly=r['poly']) for i, r in enumerate(ordered)]
 
-    # Return the segmentation result
+    # Return the segmentation result; labels, edges and the outline are derived lazily
     return SegmentationResult(
-        outline_path_svg=outline_d,
         segmentation_poly=inset_poly,
         regions=regions,
-        labels=labels,
-        voronoi_edges=voronoi_edges
+        seed_points=pts,
+        region_seeds=np.array([r['index'] for r in ordered], dtype=np.intp),
+        outline_source=partial(word_svg_path, word, font_path, font_size, atlas=atlas),
+        glyph_source=partial(text_glyph_outlines, word, font_path, font_size, atlas=atlas),
+        outline_bounds=word_poly.bounds,
     )
@@ -1,5 +1,10 @@
 from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable
+import numpy as np
+import shapely
 from shapely.geometry import Polygon, Point, LineString
+from .voronoi import voronoi_edges
 
 @dataclass(frozen=True)
 class Region:
@@ -14,8 +19,99 @@ class Label:
 
 @dataclass(frozen=True)
 class SegmentationResult:
-    outline_path_svg: str
+    """Segmented regions of a glyph outline.
+
+    Only the regions are computed up front. The outline SVG path, labels and
+    Voronoi edges are derived on first access and memoized, so callers that
+    only need regions never pay for them.
+
+    outline_source builds the outline SVG path string and glyph_source the
+    per-glyph outlines. Both should be picklable (e.g. a functools.partial of a
+    module-level function) so results can be shipped to worker processes.
+    """
     segmentation_poly: Polygon
     regions: list[Region]
-    labels: list[Label]
-    voronoi_edges: list[LineString] = None  # Optional Voronoi cell boundaries
+    seed_points: np.ndarray  # All relaxed seeds (Nx2), including those of dropped cells
+    region_seeds: np.ndarray  # Index into seed_points of each region's seed
+    outline_source: Callable[[], str]
+    glyph_source: Callable[[], list[tuple[str, float]]] | None = None
+    outline_bounds: tuple[float, float, float, float] | None = None  # Of the glyph outline, before inset
+
+    @cached_property
+    def outline_path_svg(self) -> str:
+        return self.outline_source()
+
+    @cached_property
+    def glyph_outlines(self) -> list[tuple[str, float]]:
+        """(svg_path_d, x_offset) per glyph, each path at the origin."""
+        if self.glyph_source is None:
+            return [(self.outline_path_svg, 0.0)]
+        return self.glyph_source()
+
+    @cached_property
+    def labels(self) -> list[Label]:
+        labels = []
+        for region, seed_idx in zip(self.regions, self.region_seeds):
+            # Place label at the seed if it's inside the region, otherwise at a representative point
+            x, y = self.seed_points[seed_idx]
+            label_pt = Point(x, y)
+            if not region.poly.contains(label_pt):
+                label_pt = region.poly.representative_point()
+            labels.append(Label(id=region.id, point=label_pt, text=str(region.id)))
+        return labels
+
+    @cached_property
+    def voronoi_edges(self) -> list[LineString]:
+        """Voronoi cell boundaries clipped to the segmentation polygon."""
+        if len(self.seed_points) < 2:
+            return []
+        return voronoi_edges(self.seed_points, self.segmentation_poly)
+
+    @cached_property
+    def adjacency(self) -> dict[int, set[int]]:
+        """Region adjacency graph: region id -> ids of regions sharing a border.
+
+        Taken from the region polygons rather than the Voronoi diagram, so it
+        also holds for regions the repair pass reshaped. Regions meeting at a
+        single corner are not adjacent.
+        """
+        adjacency = {r.id: set() for r in self.regions}
+        if len(self.regions) < 2:
+            return adjacency
+
+        polys = np.array([r.poly for r in self.regions], dtype=object)
+        left, right = shapely.STRtree(polys).query(polys, predicate="intersects")
+        keep = left < right
+        left, right = left[keep], right[keep]
+        shared = shapely.length(shapely.intersection(shapely.boundary(polys[left]), shapely.boundary(polys[right])))
+
+        ids = np.array([r.id for r in self.regions], dtype=np.intp)
+        for a, b in zip(ids[left[shared > 0]].tolist(), ids[right[shared > 0]].tolist()):
+            adjacency[a].add(b)
+            adjacency[b].add(a)
+        return adjacency
+
+    @cached_property
+    def hit_index(self) -> shapely.STRtree:
+        """Bounding-box index over the region polygons, in region order.
+
+        The polygons themselves are prepared, so the exact point tests that
+        follow an index query (see regions_at) are fast.
+        """
+        polys = np.array([r.poly for r in self.regions], dtype=object)
+        shapely.prepare(polys)
+        return shapely.STRtree(polys)
+
+    def regions_at(self, points) -> np.ndarray:
+        """Region id under each point (0 where no region), for an Nx2 array of points."""
+        xy = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        ids = np.zeros(len(xy), dtype=np.intp)
+        if not self.regions:
+            return ids
+
+        # Candidate regions by bounding box, then an exact test against the prepared polygons
+        tree = self.hit_index
+        point_idx, region_idx = tree.query(shapely.points(xy))
+        hit = shapely.intersects_xy(tree.geometries[region_idx], xy[point_idx, 0], xy[point_idx, 1])
+        ids[point_idx[hit]] = np.array([r.id for r in self.regions], dtype=np.intp)[region_idx[hit]]
+        return ids
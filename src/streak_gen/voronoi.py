@@ -1,7 +1,23 @@
 import numpy as np
+import shapely
 from scipy.spatial import Voronoi
-from shapely.geometry import Polygon, Point, box
-from shapely.ops import unary_union
+from shapely.geometry import LineString, box
+
+
+def mirror_points(bbox):
+    """Ghost points far outside bbox that force all interior Voronoi regions to be finite."""
+    minx, miny, maxx, maxy = bbox
+    width = maxx - minx
+    height = maxy - miny
+
+    # Add points in a large 5x5 grid around the bbox (skipping the center)
+    margin = max(width, height) * 5  # Far enough to ensure all regions are finite
+    steps = np.arange(-2, 3)
+    i, j = np.meshgrid(steps, steps, indexing="ij")
+    keep = (i != 0) | (j != 0)
+    mx = minx + width / 2 + i[keep] * margin
+    my = miny + height / 2 + j[keep] * margin
+    return np.column_stack([mx, my])
 
 
 def voronoi_cells(points, bbox):
@@ -9,69 +25,68 @@ def voronoi_cells(points, bbox):
     Compute finite Voronoi cells from a set of points within a bounding box.
 
     Uses a simpler approach: add far-away mirror points around the bbox to force
-    all interior regions to be finite, then clip to bbox.
+    all interior regions to be finite, then clip to bbox. All cells are built and
+    clipped in bulk.
 
     Args:
         points: Nx2 numpy array of seed points
         bbox: tuple (minx, miny, maxx, maxy) defining the bounding box
 
     Returns:
-        list of Shapely Polygon objects representing Voronoi cells
+        (cells, fallback): array of N Shapely Polygons, and a boolean array that is
+        True where a cell could not be built and the bbox polygon was substituted
     """
-    if len(points) < 2:
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    if n < 2:
         raise ValueError("Need at least 2 points for Voronoi diagram")
 
     # Create bounding box polygon
-    minx, miny, maxx, maxy = bbox
-    bbox_poly = box(minx, miny, maxx, maxy)
+    bbox_poly = box(*bbox)
 
-    # Calculate bbox dimensions
-    width = maxx - minx
-    height = maxy - miny
+    # Compute Voronoi diagram with the original points plus mirror points
+    vor = Voronoi(np.vstack([points, mirror_points(bbox)]))
 
-    # Add mirror/ghost points far outside the bbox to force all interior regions to be finite
-    # Add points in a large grid around the bbox
-    margin = max(width, height) * 5  # Far enough to ensure all regions are finite
+    # Regions of the original points (not the mirror points)
+    regions = [vor.regions[r] for r in vor.point_region[:n]]
+    sizes = np.fromiter((len(r) for r in regions), dtype=np.intp, count=n)
+    infinite = np.fromiter((-1 in r for r in regions), dtype=bool, count=n)
+
+    # Empty, infinite or degenerate regions (shouldn't happen with mirror points) fall back to bbox
+    fallback = infinite | (sizes < 3)
+    built = np.flatnonzero(~fallback)
+
+    cells = np.full(n, bbox_poly, dtype=object)
+    if len(built):
+        # Ragged vertex indices -> one flat coordinate array plus a ring index per vertex
+        vertex_idx = np.concatenate([regions[i] for i in built])
+        ring_idx = np.repeat(np.arange(len(built)), sizes[built])
+        rings = shapely.linearrings(vor.vertices[vertex_idx], indices=ring_idx)
+
+        # Clip all cells to the bounding box at once
+        clipped = shapely.intersection(shapely.polygons(rings), bbox_poly)
+        bad = ~shapely.is_valid(clipped) | shapely.is_empty(clipped)
+
+        cells[built[~bad]] = clipped[~bad]
+        fallback[built[bad]] = True
+
+    return cells, fallback
+
+
+def voronoi_edges(points, poly):
+    """Extract the finite Voronoi edges of points that lie within poly."""
+    vor = Voronoi(points)
+
+    edges = []
+    for ridge_vertices in vor.ridge_vertices:
+        if -1 not in ridge_vertices:  # Skip infinite ridges
+            p1 = vor.vertices[ridge_vertices[0]]
+            p2 = vor.vertices[ridge_vertices[1]]
+            edge = LineString([(p1[0], p1[1]), (p2[0], p2[1])])
+
+            # Clip edge to the polygon
+            clipped_edge = edge.intersection(poly)
+            if not clipped_edge.is_empty and clipped_edge.geom_type == 'LineString':
+                edges.append(clipped_edge)
+    return edges
 
-    mirror_points = []
-    # Add points around the perimeter at a distance
-    for i in range(-2, 3):
-        for j in range(-2, 3):
-            if i == 0 and j == 0:
-                continue  # Skip the center
-            mx = minx + width/2 + i * margin
-            my = miny + height/2 + j * margin
-            mirror_points.append([mx, my])
-
-    # Combine original points with mirror points
-    all_points = np.vstack([points, mirror_points])
-
-    # Compute Voronoi diagram with all points
-    vor = Voronoi(all_points)
-
-    cells = []
-
-    # Extract cells only for the original points (not the mirror points)
-    for point_idx in range(len(points)):
-        region_idx = vor.point_region[point_idx]
-        region = vor.regions[region_idx]
-
-        # Skip empty or infinite regions (shouldn't happen with mirror points, but check anyway)
-        if not region or -1 in region:
-            # Fallback: use bbox
-            cells.append(bbox_poly)
-            continue
-
-        # Get vertices of the Voronoi cell
-        vertices = [vor.vertices[i] for i in region]
-
-        # Create polygon from vertices
-        if len(vertices) >= 3:
-            cell_poly = Polygon(vertices)
-            # Clip to bounding box
-            clipped_cell = cell_poly.intersection(bbox_poly)
-            cells.append(clipped_cell if clipped_cell.is_valid and not clipped_cell.is_empty else bbox_poly)
-        else:
-            cells.append(bbox_poly)
-
-    return cells
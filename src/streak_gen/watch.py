@@ -0,0 +1,239 @@
+"""Incremental rebuilds of the outputs listed in a JSON manifest.
+
+Each output's inputs are split into a geometry key (cache version, font or atlas
+file contents, text, segments and segmentation options) and a render key
+(geometry keys plus render options). Geometry is cached on disk next to the manifest, so an output whose
+render options changed is only re-rendered, and unchanged outputs are skipped.
+
+Manifest format:
+    {
+      "defaults": {"font": "fonts/CooperBlack.ttf", "inset": 6.0},
+      "outputs": [
+        {"out": "out/months/01_JANUARY_31.svg", "word": "january", "segments": 31},
+        {"out": "out/J_12.svg", "letter": "J", "segments": 12, "render": {"margin": 48}},
+        {"out": "out/year_calendar.svg", "year": true}
+      ]
+    }
+
+Paths are relative to the manifest. Word/letter outputs default to
+font_size=420, inset=6 and backend="shapely". Entries and defaults may also set
+"atlas" (a build-atlas file), "seeds", "relax", "repair" and "tolerance", as on
+the command line; any other key is an error. Render options are passed to
+render_letter_svg (margin, region_stroke, outline_stroke).
+"""
+import hashlib
+import json
+import pickle
+import time
+from pathlib import Path
+from .layout_year import LAYOUT_FONT_SIZE, LAYOUT_INSET, LAYOUT_SCALE, MONTHS, layout_entry, render_layout_page
+from .font_outline import text_bounds
+from .glyph_atlas import load_atlas
+from .render_svg import fit_transform, render_letter_svg
+from .segmenter import segment_letter_to_regions, segment_word_to_regions
+
+CACHE_DIR_NAME = ".streak-gen-cache"
+# Bump whenever segmentation output changes, so cached geometry from older versions is not reused
+CACHE_VERSION = 2
+RENDER_DEFAULTS = {"margin": 36.0, "region_stroke": "gray", "outline_stroke": "black"}
+# Keys a manifest entry (and, except the first five, "defaults") may set
+ENTRY_KEYS = {"out", "word", "letter", "segments", "year"}
+OPTION_KEYS = {"font", "atlas", "font_size", "inset", "backend", "seeds", "relax", "repair", "tolerance", "render"}
+
+
+def _digest(data) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()[:24]
+
+
+def _check_keys(options: dict, allowed: set, where: str):
+    unknown = sorted(set(options) - allowed)
+    if unknown:
+        raise ValueError(f"Unknown manifest key(s) in {where}: {', '.join(unknown)}")
+
+
+class ManifestBuilder:
+    """Rebuilds manifest outputs, reusing geometry and skipping up-to-date files."""
+
+    def __init__(self, manifest_path: Path):
+        self.manifest_path = Path(manifest_path)
+        self.root = self.manifest_path.parent
+        self.cache_dir = self.root / CACHE_DIR_NAME
+        self.state_path = self.cache_dir / "state.json"
+        self._file_hashes = {}  # path -> ((mtime_ns, size), sha256)
+        self._geometry = {}  # geometry key -> SegmentationResult
+
+    def _file_hash(self, path: Path) -> str:
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._file_hashes.get(path)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, hashlib.sha256(path.read_bytes()).hexdigest())
+            self._file_hashes[path] = cached
+        return cached[1]
+
+    def _geometry_spec(self, kind: str, text: str, segments: int, options: dict, output_scale=None):
+        """Geometry key, spec and input paths for one segmentation.
+
+        output_scale (output units per font unit) converts a tolerance; if not
+        given it is the page fit of the text, as for gen-letter/gen-word.
+        """
+        font_path = (self.root / options["font"]).resolve()
+        atlas_path = (self.root / options["atlas"]).resolve() if options.get("atlas") else None
+        tolerance = options.get("tolerance")
+        font_size = float(options.get("font_size", 420.0))
+        spec = {
+            "version": CACHE_VERSION,
+            "kind": kind,
+            "text": text.upper(),
+            "segments": segments,
+            "font": self._file_hash(font_path),
+            "atlas": self._file_hash(atlas_path) if atlas_path else None,
+            "font_size": font_size,
+            "inset": float(options.get("inset", 6.0)),
+            "backend": options.get("backend", "shapely"),
+            "seeds": options.get("seeds", "random"),
+            "relax": options.get("relax"),
+            "repair": bool(options.get("repair", True)),
+            "tolerance": float(tolerance) if tolerance else None,
+            "output_scale": 1.0,
+        }
+        if tolerance:
+            if output_scale is None:
+                atlas = load_atlas(atlas_path) if atlas_path else None
+                margin = float({**RENDER_DEFAULTS, **options.get("render", {})}["margin"])
+                bounds = text_bounds(spec["text"], font_path, font_size, atlas=atlas)
+                output_scale = fit_transform(bounds, margin)[0]
+            spec["output_scale"] = float(output_scale)
+        return _digest(spec), spec, (font_path, atlas_path)
+
+    def _load_geometry(self, key: str, spec: dict, paths):
+        """Return (result, reused) for a geometry key, segmenting only on a cache miss."""
+        if key in self._geometry:
+            return self._geometry[key], True
+
+        pickle_path = self.cache_dir / "geometry" / f"{key}.pickle"
+        if pickle_path.exists():
+            with open(pickle_path, "rb") as f:
+                result = pickle.load(f)
+            self._geometry[key] = result
+            return result, True
+
+        font_path, atlas_path = paths
+        segment = segment_word_to_regions if spec["kind"] == "word" else segment_letter_to_regions
+        result = segment(
+            spec["text"],
+            font_path,
+            spec["segments"],
+            font_size=spec["font_size"],
+            inset=spec["inset"],
+            atlas=load_atlas(atlas_path) if atlas_path else None,
+            backend=spec["backend"],
+            tolerance=spec["tolerance"],
+            output_scale=spec["output_scale"],
+            seed_method=spec["seeds"],
+            relax_iterations=spec["relax"],
+            repair=spec["repair"],
+        )
+        # Build the lazy artifacts now so they are cached along with the regions
+        _ = result.outline_path_svg, result.glyph_outlines, result.labels
+
+        pickle_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(pickle_path, "wb") as f:
+            pickle.dump(result, f)
+        self._geometry[key] = result
+        return result, False
+
+    def _output_specs(self, manifest: dict):
+        """Yield (out_path, [(geometry key, spec, paths)], render options) per output."""
+        defaults = manifest.get("defaults", {})
+        _check_keys(defaults, OPTION_KEYS, "defaults")
+        for entry in manifest["outputs"]:
+            _check_keys(entry, ENTRY_KEYS | OPTION_KEYS, entry.get("out", "output"))
+            options = {**defaults, **entry}
+            render = {**RENDER_DEFAULTS, **defaults.get("render", {}), **entry.get("render", {})}
+            _check_keys(render, set(RENDER_DEFAULTS), f"{entry.get('out', 'output')} render")
+            out_path = self.root / entry["out"]
+
+            if entry.get("year"):
+                year_options = {**options, "font_size": LAYOUT_FONT_SIZE, "inset": LAYOUT_INSET}
+                geometry = [self._geometry_spec("word", name, days, year_options, output_scale=LAYOUT_SCALE)
+                            for name, days, _ in MONTHS]
+                render = {}  # The year page has no render options besides level of detail
+            elif "word" in entry:
+                geometry = [self._geometry_spec("word", entry["word"], entry["segments"], options)]
+            elif "letter" in entry:
+                geometry = [self._geometry_spec("letter", entry["letter"], entry["segments"], options)]
+            else:
+                raise ValueError(f"Manifest output needs 'word', 'letter' or 'year': {entry}")
+            render["tolerance"] = options.get("tolerance")
+
+            yield out_path, geometry, render
+
+    def build(self):
+        """Rebuild outputs whose inputs changed.
+
+        Returns:
+            dict with counts of "segmented", "rendered" and "skipped" outputs
+        """
+        manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        state = json.loads(self.state_path.read_text(encoding="utf-8")) if self.state_path.exists() else {}
+        counts = {"segmented": 0, "rendered": 0, "skipped": 0}
+
+        for out_path, geometry, render in self._output_specs(manifest):
+            render_key = _digest({"geometry": [key for key, _, _ in geometry], "render": render})
+            if state.get(str(out_path)) == render_key and out_path.exists():
+                counts["skipped"] += 1
+                continue
+
+            loaded = [self._load_geometry(key, spec, paths) for key, spec, paths in geometry]
+            results = [result for result, _ in loaded]
+
+            if len(geometry) > 1:
+                entries = [
+                    layout_entry(name, days, result, rotation)
+                    for (name, days, rotation), result in zip(MONTHS, results)
+                ]
+                svg_text = render_layout_page(entries, tolerance=render["tolerance"])
+            else:
+                result = results[0]
+                svg_text = render_letter_svg(
+                    page="letter",
+                    outline_path_svg=result.outline_path_svg,
+                    regions=result.regions,
+                    labels=result.labels,
+                    **render,
+                )
+
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            out_path.write_text(svg_text, encoding="utf-8")
+            state[str(out_path)] = render_key
+
+            if all(reused for _, reused in loaded):
+                counts["rendered"] += 1
+                print(f"  ✓ {out_path} (re-rendered)")
+            else:
+                counts["segmented"] += 1
+                print(f"  ✓ {out_path} (segmented)")
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        return counts
+
+
+def watch(manifest_path: Path, interval: float = 1.0, once: bool = False):
+    """Build the manifest, then keep polling and rebuilding what changed (until Ctrl-C)."""
+    builder = ManifestBuilder(manifest_path)
+    while True:
+        try:
+            counts = builder.build()
+            if counts["segmented"] or counts["rendered"]:
+                print(f"Rebuilt {counts['segmented']} segmented, {counts['rendered']} re-rendered, "
+                      f"{counts['skipped']} up to date")
+        except (OSError, ValueError, KeyError) as e:
+            # Keep watching while the manifest or a font is mid-edit
+            if once:
+                raise
+            print(f"Build failed: {e}")
+        if once:
+            return
+        time.sleep(interval)